@@ -8,15 +8,17 @@ from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_current_user, get_db, invalidate_active_user
 from app.core.config import settings
 from app.core.security import (
     create_access_token,
     generate_refresh_token,
     hash_password,
     hash_refresh_token,
+    verify_and_update_password,
     verify_password,
 )
+from app.db.refresh_tokens import rotate_refresh_token
 from app.models import AuthIdentity, PasswordCredential, RefreshToken, User
 from app.schemas.auth import (
     GoogleExchangeRequest,
@@ -52,8 +54,20 @@ def _clear_refresh_cookie(resp: Response) -> None:
     )
 
 
+def _profile_claims(user: User) -> dict | None:
+    if not settings.auth_trust_token_claims:
+        return None
+    return {
+        "active": user.is_active,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+        "phone": user.phone,
+    }
+
+
 def _issue_tokens(db: Session, *, user: User, request: Request, response: Response) -> TokenResponse:
-    access = create_access_token(user_id=user.id)
+    access = create_access_token(user_id=user.id, profile_claims=_profile_claims(user))
 
     refresh_plain = generate_refresh_token()
     refresh_hash = hash_refresh_token(refresh_plain)
@@ -119,8 +133,14 @@ def login(payload: LoginRequest, request: Request, response: Response, db: Sessi
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     cred = db.get(PasswordCredential, user.id)
-    if cred is None or not verify_password(payload.password, cred.password_hash):
+    if cred is None:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    verified, upgraded_hash = verify_and_update_password(payload.password, cred.password_hash)
+    if not verified:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if upgraded_hash is not None:
+        # Committed with the refresh token below.
+        cred.password_hash = upgraded_hash
 
     return _issue_tokens(db, user=user, request=request, response=response)
 
@@ -132,6 +152,21 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
         raise HTTPException(status_code=401, detail="Missing refresh token")
 
     token_hash = hash_refresh_token(raw)
+    new_plain = generate_refresh_token()
+    user_id = rotate_refresh_token(
+        db,
+        token_hash=token_hash,
+        new_token_hash=hash_refresh_token(new_plain),
+        user_agent=request.headers.get("user-agent"),
+        ip_address=request.client.host if request.client else None,
+    )
+    if user_id is not None:
+        db.commit()
+        profile_claims = _profile_claims(db.get(User, user_id)) if settings.auth_trust_token_claims else None
+        _set_refresh_cookie(response, new_plain)
+        return TokenResponse(access_token=create_access_token(user_id=user_id, profile_claims=profile_claims))
+
+    # Rotation matched nothing; work out why so the client gets the same errors as before.
     rt = db.execute(select(RefreshToken).where(RefreshToken.token_hash == token_hash)).scalar_one_or_none()
     if rt is None or rt.revoked_at is not None:
         _clear_refresh_cookie(response)
@@ -144,28 +179,8 @@ def refresh(request: Request, response: Response, db: Session = Depends(get_db))
         _clear_refresh_cookie(response)
         raise HTTPException(status_code=401, detail="Refresh token expired")
 
-    user = db.get(User, rt.user_id)
-    if user is None or not user.is_active:
-        _clear_refresh_cookie(response)
-        raise HTTPException(status_code=401, detail="User not found")
-
-    new_plain = generate_refresh_token()
-    new_hash = hash_refresh_token(new_plain)
-    rt.revoked_at = now
-    rt.replaced_by_token_hash = new_hash
-    db.add(
-        RefreshToken(
-            user_id=user.id,
-            token_hash=new_hash,
-            expires_at=now + timedelta(days=settings.refresh_token_expire_days),
-            user_agent=request.headers.get("user-agent"),
-            ip_address=request.client.host if request.client else None,
-        )
-    )
-    db.commit()
-
-    _set_refresh_cookie(response, new_plain)
-    return TokenResponse(access_token=create_access_token(user_id=user.id))
+    _clear_refresh_cookie(response)
+    raise HTTPException(status_code=401, detail="User not found")
 
 
 @router.post("/logout")
@@ -198,6 +213,10 @@ def update_me(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    # The dependency may hand back a cached, detached copy; edit the session's row.
+    current_user = db.get(User, current_user.id)
+    if current_user is None or not current_user.is_active:
+        raise HTTPException(status_code=401, detail="User not found")
     if payload.new_password:
         if not payload.current_password:
             raise HTTPException(status_code=400, detail="Current password is required to set a new password")
@@ -221,6 +240,7 @@ def update_me(
             current_user.email = email_norm
 
     db.commit()
+    invalidate_active_user(current_user.id)
     db.refresh(current_user)
     return MeResponse(
         id=current_user.id,
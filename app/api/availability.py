@@ -6,6 +6,7 @@ from typing import List
 from app.api.deps import get_current_user, get_db
 from app.models import User, TimeSlotPreference
 from app.schemas.availability import TimeSlotCreate, TimeSlotResponse
+from app.services.recommendations import invalidate_weekly_availability
 
 router = APIRouter(prefix="/availability", tags=["availability"])
 
@@ -43,6 +44,7 @@ def update_availability(
         db.add_all(new_slots)
         
     db.commit()
+    invalidate_weekly_availability(current_user.id)
     
     return db.execute(
         select(TimeSlotPreference).where(TimeSlotPreference.user_id == current_user.id)
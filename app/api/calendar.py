@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
 
-from app.api.deps import get_current_user, get_db
-from app.db.calendars import get_or_create_user_calendar
+from app.api.deps import get_async_db, get_current_user, get_current_user_async, get_db
+from app.api.pagination import limit_clause, set_next_cursor, time_window_filters
+from app.core.config import settings
+from app.db.busy_intervals import refresh_meeting_busy_intervals
+from app.db.calendars import get_or_create_user_calendar, get_or_create_user_calendar_async
 from app.models import User
+from app.services.recommendations import invalidate_weekly_availability
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
 
@@ -42,8 +47,57 @@ class AvailabilityUpdate(BaseModel):
 
 # ── Events ────────────────────────────────────────────────────────────────────
 
-@router.get("/events")
+def _events_query(
+    params: dict,
+    *,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    cursor: Optional[str],
+    limit: Optional[int],
+):
+    filters = time_window_filters(params, window_start=window_start, window_end=window_end, cursor=cursor)
+    return text(f"""
+    SELECT
+        m.id,
+        m.title,
+        m.location,
+        CASE
+            WHEN COUNT(ma_all.user_id) FILTER (WHERE ma_all.status = 'maybe') > 0
+                THEN '#facc15'
+            WHEN COUNT(ma_all.user_id) FILTER (WHERE ma_all.status = 'declined') > 0
+                AND me.status = 'accepted'
+                THEN '#ef4444'
+            ELSE COALESCE(m.color, '#3498db')
+        END AS color,
+        m.start_time,
+        m.end_time,
+        me.status AS current_user_status
+    FROM meetings m
+    LEFT JOIN meeting_attendees ma_all ON ma_all.meeting_id = m.id
+    LEFT JOIN meeting_attendees me ON me.meeting_id = m.id AND me.user_id = :user_id
+    WHERE
+        m.status <> 'cancelled'
+        AND (
+            m.calendar_id = :calendar_id
+            OR
+            EXISTS (
+                SELECT 1 FROM meeting_attendees ma
+                WHERE ma.meeting_id = m.id
+                  AND ma.user_id = :user_id
+                  AND ma.status IN ('accepted', 'maybe')
+            )
+        ){filters}
+    GROUP BY m.id, m.title, m.location, m.color, m.start_time, m.end_time, me.status
+    ORDER BY m.start_time ASC, m.id ASC{limit_clause(params, limit)}
+""")
+
+
 def get_events(
+    response: Response,
+    window_start: Optional[datetime] = Query(None, alias="from"),
+    window_end: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -53,50 +107,42 @@ def get_events(
       1. Meetings the user owns (via calendar_id)
       2. Meetings the user accepted or marked maybe via meeting_attendees
     Excludes cancelled meetings from both sources.
+    Optional from/to bound the overlap window; limit + cursor page through it,
+    with the next cursor returned in the X-Next-Cursor header.
     """
     calendar_id = get_or_create_user_calendar(current_user.id, db)
 
-    events = db.execute(text("""
-        SELECT
-            m.id,
-            m.title,
-            m.location,
-            CASE
-                WHEN COUNT(ma_all.user_id) FILTER (WHERE ma_all.status = 'maybe') > 0
-                    THEN '#facc15'
-                WHEN COUNT(ma_all.user_id) FILTER (WHERE ma_all.status = 'declined') > 0
-                    AND me.status = 'accepted'
-                    THEN '#ef4444'
-                ELSE COALESCE(m.color, '#3498db')
-            END AS color,
-            m.start_time,
-            m.end_time,
-            me.status AS current_user_status
-        FROM meetings m
-        LEFT JOIN meeting_attendees ma_all ON ma_all.meeting_id = m.id
-        LEFT JOIN meeting_attendees me ON me.meeting_id = m.id AND me.user_id = :user_id
-        WHERE
-            COALESCE(m.status, 'confirmed') <> 'cancelled'
-            AND (
-                m.calendar_id = :calendar_id
-                OR
-                EXISTS (
-                    SELECT 1 FROM meeting_attendees ma
-                    WHERE ma.meeting_id = m.id
-                      AND ma.user_id = :user_id
-                      AND ma.status IN ('accepted', 'maybe')
-                )
-            )
-        GROUP BY m.id, m.title, m.location, m.color, m.start_time, m.end_time, me.status
-        ORDER BY m.start_time ASC
-    """), {
-        "calendar_id": calendar_id,
-        "user_id": current_user.id,
-    }).mappings().all()
+    params = {"calendar_id": calendar_id, "user_id": current_user.id}
+    query = _events_query(params, window_start=window_start, window_end=window_end, cursor=cursor, limit=limit)
+    events = db.execute(query, params).mappings().all()
+    set_next_cursor(response, events, limit)
 
     return [dict(e) for e in events]
 
 
+async def get_events_async(
+    response: Response,
+    window_start: Optional[datetime] = Query(None, alias="from"),
+    window_end: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Async-engine variant of get_events, registered when ASYNC_DB_ENABLED is set."""
+    calendar_id = await get_or_create_user_calendar_async(current_user.id, db)
+
+    params = {"calendar_id": calendar_id, "user_id": current_user.id}
+    query = _events_query(params, window_start=window_start, window_end=window_end, cursor=cursor, limit=limit)
+    events = (await db.execute(query, params)).mappings().all()
+    set_next_cursor(response, events, limit)
+
+    return [dict(e) for e in events]
+
+
+router.get("/events")(get_events_async if settings.async_db_enabled else get_events)
+
+
 @router.post("/events")
 def create_event(
     payload: EventCreate = Body(...),
@@ -123,6 +169,7 @@ def create_event(
         "created_by": current_user.id,
     }).fetchone()
 
+    refresh_meeting_busy_intervals(result.id, db)
     db.commit()
     return dict(result._mapping)
 
@@ -171,6 +218,7 @@ def update_event(
         RETURNING id, title, location, COALESCE(color, '#3498db') AS color, start_time, end_time
     """), updates).fetchone()
 
+    refresh_meeting_busy_intervals(event_id, db)
     db.commit()
     return dict(result._mapping)
 
@@ -237,6 +285,7 @@ def create_availability(
     }).fetchone()
 
     db.commit()
+    invalidate_weekly_availability(current_user.id)
     return dict(result._mapping)
 
 
@@ -260,4 +309,5 @@ def delete_availability(
     """), {"slot_id": slot_id})
 
     db.commit()
+    invalidate_weekly_availability(current_user.id)
     return {"message": "Availability slot deleted"}
@@ -1,11 +1,19 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_access_token
-from app.db.session import SessionLocal
-from app.models import GroupMembership, User
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.security import decode_access_claims
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.models import User
+
+
+# Column snapshots of active users, so authenticated requests that only need the caller's id or
+# profile skip the users lookup. Entries are detached copies; load the row from the session to modify it.
+active_user_cache = LRUCache(settings.active_user_cache_size, settings.active_user_cache_ttl_seconds)
+_USER_SNAPSHOT_FIELDS = ("id", "first_name", "last_name", "email", "phone", "is_active", "created_at", "updated_at")
 
 
 def get_db() -> Session:
@@ -16,42 +24,80 @@ def get_db() -> Session:
         db.close()
 
 
+async def get_async_db() -> AsyncSession:
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled; set ASYNC_DB_ENABLED=true")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 bearer = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
-    db: Session = Depends(get_db),
-) -> User:
+def _user_from_token(creds: HTTPAuthorizationCredentials | None) -> tuple[int, User | None]:
+    """Validate the bearer token; returns the user id and, when no DB lookup is needed, the user."""
     if creds is None or not creds.credentials:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     try:
-        user_id = decode_access_token(creds.credentials)
+        claims = decode_access_claims(creds.credentials)
     except ValueError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    user_id = int(claims["sub"])
+
+    if settings.auth_trust_token_claims and claims.get("active") is True and "email" in claims:
+        return user_id, User(
+            id=user_id,
+            first_name=claims.get("first_name", ""),
+            last_name=claims.get("last_name", ""),
+            email=claims["email"],
+            phone=claims.get("phone"),
+            is_active=True,
+        )
 
-    user = db.get(User, user_id)
+    snapshot = active_user_cache.get(user_id)
+    if snapshot is not None:
+        return user_id, User(**snapshot)
+    return user_id, None
+
+
+def _remember_active_user(user: User | None, generation: int) -> User:
     if user is None or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found")
+    active_user_cache.set(
+        user.id,
+        {field: getattr(user, field) for field in _USER_SNAPSHOT_FIELDS},
+        generation=generation,
+    )
     return user
 
 
-def require_group_role(*allowed_roles: str):
-    allowed = set(allowed_roles)
+def get_current_user(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id, user = _user_from_token(creds)
+    if user is not None:
+        return user
+    generation = active_user_cache.generation
+    return _remember_active_user(db.get(User, user_id), generation)
+
 
-    def _dep(group_id: int, user: User = Depends(get_current_user), db: Session = Depends(get_db)) -> GroupMembership:
-        gm = db.execute(
-            select(GroupMembership).where(GroupMembership.group_id == group_id, GroupMembership.user_id == user.id)
-        ).scalar_one_or_none()
+async def get_current_user_async(
+    creds: HTTPAuthorizationCredentials | None = Depends(bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """get_current_user for async routes: never touches the sync engine or the threadpool."""
+    user_id, user = _user_from_token(creds)
+    if user is not None:
+        return user
+    generation = active_user_cache.generation
+    return _remember_active_user(await db.get(User, user_id), generation)
 
-        if gm is None:
-            raise HTTPException(status_code=403, detail="Not a member of this group")
-        if allowed and gm.role not in allowed:
-            raise HTTPException(status_code=403, detail="Insufficient permissions")
-        return gm
 
-    return _dep
+def invalidate_active_user(user_id: int) -> None:
+    """Drop a cached user after a profile change or deactivation."""
+    active_user_cache.invalidate(user_id)
 
 
 def require_self(user_id: int, user: User = Depends(get_current_user)) -> User:
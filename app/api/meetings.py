@@ -1,8 +1,14 @@
+from datetime import datetime
+
 from sqlalchemy import bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_async_db, get_current_user, get_current_user_async, get_db
+from app.api.pagination import limit_clause, set_next_cursor, time_window_filters
+from app.core.config import settings
+from app.db.busy_intervals import refresh_meeting_busy_intervals
 from app.db.calendars import get_or_create_user_calendar
 from app.models import User
 from app.schemas.meetings import MeetingCreate, MeetingResponse, MeetingRsvpUpdate, MeetingUpdate
@@ -120,10 +126,21 @@ def _fetch_meeting_row(meeting_id: int, user_id: int, db: Session):
     return dict(meeting)
 
 
+_ATTENDEE_ORDER = """
+    CASE ma.status
+        WHEN 'accepted' THEN 0
+        WHEN 'maybe' THEN 1
+        WHEN 'invited' THEN 2
+        ELSE 3
+    END,
+    u.email ASC
+"""
+
+
 def _fetch_attendees(meeting_id: int, db: Session) -> list[dict]:
     attendees = db.execute(
         text(
-            """
+            f"""
             SELECT
                 ma.user_id,
                 u.email,
@@ -133,14 +150,7 @@ def _fetch_attendees(meeting_id: int, db: Session) -> list[dict]:
             FROM meeting_attendees ma
             JOIN users u ON u.id = ma.user_id
             WHERE ma.meeting_id = :meeting_id
-            ORDER BY
-                CASE ma.status
-                    WHEN 'accepted' THEN 0
-                    WHEN 'maybe' THEN 1
-                    WHEN 'invited' THEN 2
-                    ELSE 3
-                END,
-                u.email ASC
+            ORDER BY {_ATTENDEE_ORDER}
             """
         ),
         {"meeting_id": meeting_id},
@@ -148,6 +158,38 @@ def _fetch_attendees(meeting_id: int, db: Session) -> list[dict]:
     return [dict(row) for row in attendees]
 
 
+def _attendees_for_meetings_query():
+    return text(
+        f"""
+        SELECT
+            ma.meeting_id,
+            ma.user_id,
+            u.email,
+            u.first_name,
+            u.last_name,
+            ma.status
+        FROM meeting_attendees ma
+        JOIN users u ON u.id = ma.user_id
+        WHERE ma.meeting_id = ANY(:meeting_ids)
+        ORDER BY ma.meeting_id, {_ATTENDEE_ORDER}
+        """
+    )
+
+
+def _attach_attendees(meetings, attendee_rows) -> list[dict]:
+    attendees_by_meeting: dict[int, list[dict]] = {}
+    for row in attendee_rows:
+        attendee = dict(row)
+        attendees_by_meeting.setdefault(attendee.pop("meeting_id"), []).append(attendee)
+
+    items = []
+    for meeting in meetings:
+        item = dict(meeting)
+        item["attendees"] = attendees_by_meeting.get(item["id"], [])
+        items.append(item)
+    return items
+
+
 def _serialize_meeting(meeting_id: int, user_id: int, db: Session) -> dict:
     meeting = _fetch_meeting_row(meeting_id, user_id, db)
     meeting["attendees"] = _fetch_attendees(meeting_id, db)
@@ -207,63 +249,123 @@ def _validate_meeting_window(start_time, end_time) -> None:
         raise HTTPException(status_code=400, detail="end_time must be after start_time")
 
 
-@router.get("/", response_model=list[MeetingResponse])
+def _list_meetings_query(
+    params: dict,
+    *,
+    include_cancelled: bool,
+    window_start: datetime | None,
+    window_end: datetime | None,
+    cursor: str | None,
+    limit: int | None,
+):
+    filters = ""
+    if not include_cancelled:
+        filters = " AND m.status <> 'cancelled'"
+    filters += time_window_filters(params, window_start=window_start, window_end=window_end, cursor=cursor)
+
+    return text(
+        f"""
+        SELECT
+            m.id,
+            m.calendar_id,
+            m.title,
+            m.description,
+            m.location,
+            COALESCE(m.meeting_type, 'in_person') AS meeting_type,
+            CASE 
+            WHEN COUNT(ma.user_id) FILTER (WHERE ma.status = 'maybe') > 0
+                THEN '#facc15'
+            ELSE COALESCE(m.color, '#3498db')
+            END AS color,
+            m.start_time,
+            m.end_time,
+            m.capacity,
+            COALESCE(m.setup_minutes, 0) AS setup_minutes,
+            COALESCE(m.cleanup_minutes, 0) AS cleanup_minutes,
+            COALESCE(m.status, 'confirmed') AS status,
+            m.created_by,
+            m.created_at,
+            CASE WHEN m.created_by = :user_id THEN TRUE ELSE FALSE END AS is_organizer,
+            me.status AS current_user_status,
+            COUNT(ma.user_id) AS attendee_count,
+            COUNT(ma.user_id) FILTER (WHERE ma.status = 'accepted') AS accepted_count,
+            COUNT(ma.user_id) FILTER (WHERE ma.status = 'declined') AS declined_count,
+            COUNT(ma.user_id) FILTER (WHERE ma.status = 'maybe') AS maybe_count,
+            COUNT(ma.user_id) FILTER (WHERE ma.status = 'invited') AS invited_count
+        FROM meetings m
+        LEFT JOIN meeting_attendees ma ON ma.meeting_id = m.id
+        LEFT JOIN meeting_attendees me ON me.meeting_id = m.id AND me.user_id = :user_id
+        WHERE {_meeting_access_clause()}{filters}
+        GROUP BY m.id, me.status
+        ORDER BY m.start_time ASC, m.id ASC{limit_clause(params, limit)}
+        """
+    )
+
+
 def list_meetings(
+    response: Response,
     include_cancelled: bool = Query(False),
+    window_start: datetime | None = Query(None, alias="from"),
+    window_end: datetime | None = Query(None, alias="to"),
+    cursor: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    filters = ""
-    if not include_cancelled:
-        filters = " AND COALESCE(m.status, 'confirmed') <> 'cancelled'"
+    params = {"user_id": current_user.id}
+    query = _list_meetings_query(
+        params,
+        include_cancelled=include_cancelled,
+        window_start=window_start,
+        window_end=window_end,
+        cursor=cursor,
+        limit=limit,
+    )
+    meetings = db.execute(query, params).mappings().all()
+    set_next_cursor(response, meetings, limit)
+    if not meetings:
+        return []
 
-    meetings = db.execute(
-        text(
-            f"""
-            SELECT
-                m.id,
-                m.calendar_id,
-                m.title,
-                m.description,
-                m.location,
-                COALESCE(m.meeting_type, 'in_person') AS meeting_type,
-                CASE 
-                WHEN COUNT(ma.user_id) FILTER (WHERE ma.status = 'maybe') > 0
-                    THEN '#facc15'
-                ELSE COALESCE(m.color, '#3498db')
-                END AS color,
-                m.start_time,
-                m.end_time,
-                m.capacity,
-                COALESCE(m.setup_minutes, 0) AS setup_minutes,
-                COALESCE(m.cleanup_minutes, 0) AS cleanup_minutes,
-                COALESCE(m.status, 'confirmed') AS status,
-                m.created_by,
-                m.created_at,
-                CASE WHEN m.created_by = :user_id THEN TRUE ELSE FALSE END AS is_organizer,
-                me.status AS current_user_status,
-                COUNT(ma.user_id) AS attendee_count,
-                COUNT(ma.user_id) FILTER (WHERE ma.status = 'accepted') AS accepted_count,
-                COUNT(ma.user_id) FILTER (WHERE ma.status = 'declined') AS declined_count,
-                COUNT(ma.user_id) FILTER (WHERE ma.status = 'maybe') AS maybe_count,
-                COUNT(ma.user_id) FILTER (WHERE ma.status = 'invited') AS invited_count
-            FROM meetings m
-            LEFT JOIN meeting_attendees ma ON ma.meeting_id = m.id
-            LEFT JOIN meeting_attendees me ON me.meeting_id = m.id AND me.user_id = :user_id
-            WHERE {_meeting_access_clause()}{filters}
-            GROUP BY m.id, me.status
-            ORDER BY m.start_time ASC, m.id ASC
-            """
-        ),
-        {"user_id": current_user.id},
+    attendee_rows = db.execute(
+        _attendees_for_meetings_query(),
+        {"meeting_ids": [meeting["id"] for meeting in meetings]},
     ).mappings().all()
+    return _attach_attendees(meetings, attendee_rows)
 
-    items = []
-    for meeting in meetings:
-        item = dict(meeting)
-        item["attendees"] = _fetch_attendees(item["id"], db)
-        items.append(item)
-    return items
+
+async def list_meetings_async(
+    response: Response,
+    include_cancelled: bool = Query(False),
+    window_start: datetime | None = Query(None, alias="from"),
+    window_end: datetime | None = Query(None, alias="to"),
+    cursor: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=500),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    params = {"user_id": current_user.id}
+    query = _list_meetings_query(
+        params,
+        include_cancelled=include_cancelled,
+        window_start=window_start,
+        window_end=window_end,
+        cursor=cursor,
+        limit=limit,
+    )
+    meetings = (await db.execute(query, params)).mappings().all()
+    set_next_cursor(response, meetings, limit)
+    if not meetings:
+        return []
+
+    attendee_rows = (
+        await db.execute(_attendees_for_meetings_query(), {"meeting_ids": [meeting["id"] for meeting in meetings]})
+    ).mappings().all()
+    return _attach_attendees(meetings, attendee_rows)
+
+
+router.get("/", response_model=list[MeetingResponse])(
+    list_meetings_async if settings.async_db_enabled else list_meetings
+)
 
 
 @router.get("/{meeting_id}", response_model=MeetingResponse)
@@ -339,8 +441,9 @@ def create_meeting(
 
     meeting_id = created[0]
     _replace_attendees(meeting_id, current_user.id, attendee_user_ids, db)
-    db.commit()
+    refresh_meeting_busy_intervals(meeting_id, db)
     notify_meeting_invite(meeting_id, db)
+    db.commit()
     return _serialize_meeting(meeting_id, current_user.id, db)
 
 
@@ -398,9 +501,10 @@ def update_meeting(
         attendee_user_ids = _resolve_attendee_user_ids(db, [str(email) for email in attendee_emails])
         _replace_attendees(meeting_id, current_user.id, attendee_user_ids, db)
 
-    db.commit()
+    refresh_meeting_busy_intervals(meeting_id, db)
     if should_notify_update:
         notify_meeting_updated(meeting_id, db)
+    db.commit()
     return _serialize_meeting(meeting_id, current_user.id, db)
 
 
@@ -423,8 +527,9 @@ def cancel_meeting(
         text("UPDATE meetings SET status = 'cancelled' WHERE id = :meeting_id"),
         {"meeting_id": meeting_id},
     )
-    db.commit()
+    refresh_meeting_busy_intervals(meeting_id, db)
     notify_meeting_cancelled(meeting_id, db)
+    db.commit()
     return _serialize_meeting(meeting_id, current_user.id, db)
 
 
@@ -449,6 +554,7 @@ def get_meeting_recommendations(
         duration_minutes=payload.duration_minutes,
         max_results=payload.max_results,
         db=db,
+        allow_partial=payload.allow_partial,
     )
 
     return {
@@ -506,6 +612,7 @@ def update_rsvp(
         ),
         {"meeting_id": meeting_id, "user_id": current_user.id, "status": payload.status},
     )
+    refresh_meeting_busy_intervals(meeting_id, db)
 
     db.commit()
     return _serialize_meeting(meeting_id, current_user.id, db)
@@ -542,6 +649,7 @@ def get_reschedule_suggestions(
         max_results=payload.max_results,
         db=db,
         exclude_meeting_id=meeting_id,
+        allow_partial=payload.allow_partial,
     )
 
     return {
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_user, get_db
+from app.api.deps import get_async_db, get_current_user, get_current_user_async, get_db
+from app.core.config import settings
 from app.models import User
 from app.schemas.notifications import NotificationItem, NotificationPreferencesPayload, PendingInviteItem
 from app.services.notifications import get_or_create_notification_preferences, update_notification_preferences
@@ -28,27 +30,45 @@ def put_preferences(
     return update_notification_preferences(current_user.id, payload.model_dump(), db)
 
 
-@router.get("/", response_model=list[NotificationItem])
+_LIST_NOTIFICATIONS_QUERY = text(
+    """
+    SELECT id, meeting_id, channel, type, title, message, status, created_at, sent_at, read_at
+    FROM notifications
+    WHERE user_id = :user_id AND channel = 'in_app'
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit
+    """
+)
+
+
 def list_notifications(
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     rows = db.execute(
-        text(
-            """
-            SELECT id, meeting_id, channel, type, title, message, status, created_at, sent_at, read_at
-            FROM notifications
-            WHERE user_id = :user_id AND channel = 'in_app'
-            ORDER BY created_at DESC, id DESC
-            LIMIT :limit
-            """
-        ),
+        _LIST_NOTIFICATIONS_QUERY,
         {"user_id": current_user.id, "limit": limit},
     ).mappings().all()
     return [dict(row) for row in rows]
 
 
+async def list_notifications_async(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (
+        await db.execute(_LIST_NOTIFICATIONS_QUERY, {"user_id": current_user.id, "limit": limit})
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+router.get("/", response_model=list[NotificationItem])(
+    list_notifications_async if settings.async_db_enabled else list_notifications
+)
+
+
 @router.post("/{notification_id}/read", response_model=NotificationItem)
 def mark_notification_read(
     notification_id: int,
@@ -94,7 +114,7 @@ def list_pending_invites(
             LEFT JOIN users creator ON creator.id = m.created_by
             WHERE ma.user_id = :user_id
               AND ma.status = 'invited'
-              AND COALESCE(m.status, 'confirmed') <> 'cancelled'
+              AND m.status <> 'cancelled'
             ORDER BY m.start_time ASC, m.id ASC
             """
         ),
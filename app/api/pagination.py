@@ -0,0 +1,62 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(start_time: datetime, row_id: int) -> str:
+    raw = f"{start_time.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_raw, id_raw = base64.urlsafe_b64decode(padded).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(start_raw), int(id_raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def time_window_filters(
+    params: dict,
+    *,
+    window_start: datetime | None,
+    window_end: datetime | None,
+    cursor: str | None,
+) -> str:
+    """SQL fragment (prefixed with AND) for an overlap window plus a (start_time, id) keyset cursor on `m`."""
+    if window_start is not None and window_end is not None and window_end <= window_start:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+
+    clauses = []
+    if window_start is not None or window_end is not None:
+        # A NULL bound leaves that side of the range unbounded.
+        clauses.append(
+            "m.time_range && tstzrange(CAST(:window_start AS timestamptz), CAST(:window_end AS timestamptz), '[)')"
+        )
+        params["window_start"] = window_start
+        params["window_end"] = window_end
+    if window_end is not None:
+        # Implied by the overlap, but lets the (start_time, id) btree bound the keyset scan too.
+        clauses.append("m.start_time < :window_end")
+    if cursor is not None:
+        params["cursor_start"], params["cursor_id"] = decode_cursor(cursor)
+        clauses.append("(m.start_time, m.id) > (:cursor_start, :cursor_id)")
+    return "".join(f" AND {clause}" for clause in clauses)
+
+
+def limit_clause(params: dict, limit: int | None) -> str:
+    if limit is None:
+        return ""
+    params["limit"] = limit
+    return " LIMIT :limit"
+
+
+def set_next_cursor(response: Response, rows, limit: int | None) -> None:
+    if limit is not None and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last["start_time"], last["id"])
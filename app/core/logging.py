@@ -1,8 +1,81 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+import random
 import sys
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
 
 
-def configure_logging(level: str = "INFO") -> None:
+# Set by the request middleware; copied into every record emitted while the request runs.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is emitted
+# as its own JSON field.
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "sampled"}
+
+_listener: QueueListener | None = None
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only `rate` of the INFO-and-below records logged with extra={"sampled": True}."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1 or not getattr(record, "sampled", False) or record.levelno > logging.INFO:
+            return True
+        record.sample_rate = self.rate
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        if record.stack_info:
+            payload["stack"] = record.stack_info
+        return json.dumps(payload, default=str)
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    # The stock prepare() formats the record with a plain formatter, folding the traceback into
+    # the message; keep them apart so the listener's formatter decides the layout.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level: str = "INFO", *, json_format: bool = False, info_sample_rate: float = 1.0) -> None:
+    global _listener
     root = logging.getLogger()
 
     # Avoid duplicate handlers if configure_logging is called multiple times.
@@ -10,13 +83,24 @@ def configure_logging(level: str = "INFO") -> None:
         root.setLevel(level.upper())
         return
 
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(
-        logging.Formatter(
-            fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
-            datefmt="%Y-%m-%dT%H:%M:%S%z",
+    # Request threads only enqueue; a listener thread does the formatting and the stdout writes.
+    stream = logging.StreamHandler(sys.stdout)
+    if json_format:
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(
+            logging.Formatter(
+                fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
+                datefmt="%Y-%m-%dT%H:%M:%S%z",
+            )
         )
-    )
+
+    handler = _NonBlockingQueueHandler(queue.SimpleQueue())
+    handler.addFilter(RequestContextFilter())
+    handler.addFilter(SamplingFilter(info_sample_rate))
+    _listener = QueueListener(handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
 
     root.addHandler(handler)
     root.setLevel(level.upper())
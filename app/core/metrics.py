@@ -0,0 +1,155 @@
+"""Process-local Prometheus metrics rendered in the text exposition format.
+
+HTTP metrics are recorded by the request_logging middleware; pool, cache and hashing figures
+are read from their existing stats() helpers at scrape time. With several worker processes each
+one reports its own numbers, so scrape them per worker or aggregate by instance.
+"""
+
+import bisect
+import threading
+from collections.abc import Callable, Iterable
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INF_BUCKET = 'le="+Inf"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            self._values[()] = 0
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += 1
+            state[2] += value
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((labels, (list(state[0]), state[1], state[2])) for labels, state in self._values.items())
+        lines = self.header()
+        for labels, (bucket_counts, count, total) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = _labels(self.labelnames, labels, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, _INF_BUCKET)} {count}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+        return lines
+
+
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_errors_total = Counter(
+    "http_request_errors_total", "HTTP requests that raised or returned 5xx.", ("method", "route")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")
+)
+http_requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+_METRICS: list[_Metric] = [
+    http_requests_total,
+    http_request_errors_total,
+    http_request_duration_seconds,
+    http_requests_in_flight,
+]
+
+# Scrape-time readers returning (name, type, help, [(labels, value), ...]).
+_COLLECTORS: list[Callable[[], Iterable[tuple[str, str, str, list[tuple[dict, float]]]]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[tuple[str, str, str, list[tuple[dict, float]]]]]) -> None:
+    _COLLECTORS.append(collector)
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    http_requests_total.inc(method, route, str(status))
+    http_request_duration_seconds.observe(seconds, method, route)
+    if status >= 500:
+        http_request_errors_total.inc(method, route)
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for collector in _COLLECTORS:
+        for name, kind, documentation, samples in collector():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,83 @@
+"""Statistical request profiler writing folded stacks for flamegraph tools.
+
+Sync endpoints run on threadpool threads, so a profiler attached to the event loop thread would
+miss their work. Instead a sampler thread snapshots every thread's stack with
+sys._current_frames() while the profiled request is in flight, skipping threads parked in
+queue/lock/selector waits. Requests running concurrently on other threads show up in the same
+samples, so profile on a quiet instance (or with a low sample rate) when that matters.
+
+Output is one `<stack;frames> <count>` line per distinct stack (Brendan Gregg's folded format),
+readable by speedscope, flamegraph.pl and inferno.
+"""
+
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from app.core.config import settings
+
+
+_IDLE_MODULES = {"threading", "queue", "selectors", "multiprocessing.connection"}
+# Background loops that block inside C (SimpleQueue.get), so their innermost Python frame is their own.
+_IDLE_FUNCTIONS = {("logging.handlers", "dequeue"), ("app.core.tracing", "_run")}
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    module = frame.f_globals.get("__name__")
+    return module in _IDLE_MODULES or (module, frame.f_code.co_name) in _IDLE_FUNCTIONS
+
+
+class StackSampler:
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def should_profile(header_value: str | None) -> bool:
+    token = settings.profiling_header_token
+    if token and header_value is not None and hmac.compare_digest(header_value.encode("utf-8"), token.encode("utf-8")):
+        return True
+    return settings.profiling_sample_rate > 0 and random.random() < settings.profiling_sample_rate
+
+
+def write_profile(sampler: StackSampler, *, request_id: str, label: str) -> str:
+    """Write the folded stacks to profiling_dir and return the file name."""
+    os.makedirs(settings.profiling_dir, exist_ok=True)
+    name = _UNSAFE_FILENAME.sub("_", f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{request_id}").strip("_")[:200]
+    filename = f"{name}.folded"
+    with open(os.path.join(settings.profiling_dir, filename), "w", encoding="utf-8") as handle:
+        for stack, count in sampler.samples.most_common():
+            handle.write(f"{stack} {count}\n")
+    return filename
@@ -1,29 +1,129 @@
 import base64
 import hashlib
+import multiprocessing
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 
-from jose import JWTError, jwt
+from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.jwt_verifier import verify_jwt
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+PASSWORD_HASH_SCHEMES = ("bcrypt", "argon2")
+
+
+class PasswordHashingBusy(RuntimeError):
+    pass
+
+
+def _password_hash_params() -> tuple:
+    if settings.password_hash_scheme not in PASSWORD_HASH_SCHEMES:
+        raise ValueError(f"Unknown password hash scheme: {settings.password_hash_scheme}")
+    return (
+        settings.password_hash_scheme,
+        settings.bcrypt_rounds,
+        settings.argon2_time_cost,
+        settings.argon2_memory_cost,
+        settings.argon2_parallelism,
+    )
+
+
+@lru_cache(maxsize=4)
+def _crypt_context(params: tuple) -> CryptContext:
+    # Both schemes stay verifiable; hashes made with another scheme or cost report needs_update.
+    scheme, bcrypt_rounds, argon2_time_cost, argon2_memory_cost, argon2_parallelism = params
+    return CryptContext(
+        schemes=list(PASSWORD_HASH_SCHEMES),
+        default=scheme,
+        deprecated="auto",
+        bcrypt__rounds=bcrypt_rounds,
+        argon2__type="ID",
+        argon2__time_cost=argon2_time_cost,
+        argon2__memory_cost=argon2_memory_cost,
+        argon2__parallelism=argon2_parallelism,
+    )
+
+
+def _hash(params: tuple, password: str) -> str:
+    return _crypt_context(params).hash(password)
+
+
+def _verify_and_update(params: tuple, password: str, password_hash: str) -> tuple[bool, str | None]:
+    return _crypt_context(params).verify_and_update(password, password_hash)
+
+
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+_hash_in_flight = 0
+
+
+def _run_hashing(fn, *args):
+    """Run a hashing call on the dedicated process pool, or inline when password_hash_workers is 0."""
+    global _hash_pool, _hash_in_flight
+    params = _password_hash_params()
+    if settings.password_hash_workers <= 0:
+        return fn(params, *args)
+
+    with _hash_pool_lock:
+        if _hash_in_flight >= settings.password_hash_workers + settings.password_hash_max_queue:
+            raise PasswordHashingBusy("Password hashing queue is full")
+        if _hash_pool is None:
+            # spawn: forking a process that already runs server threads is unsafe.
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        _hash_in_flight += 1
+        pool = _hash_pool
+
+    try:
+        return pool.submit(fn, params, *args).result()
+    finally:
+        with _hash_pool_lock:
+            _hash_in_flight -= 1
+
+
+def password_hashing_stats() -> dict[str, int]:
+    with _hash_pool_lock:
+        workers = max(settings.password_hash_workers, 0)
+        return {
+            "workers": workers,
+            "in_flight": _hash_in_flight,
+            "queue_depth": max(_hash_in_flight - workers, 0),
+        }
+
+
+def shutdown_password_hashing() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _run_hashing(_hash, password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return verify_and_update_password(password, password_hash)[0]
 
 
-def create_access_token(*, user_id: int) -> str:
+def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """Verify a password; on success also return a fresh hash if the stored one uses outdated parameters."""
+    return _run_hashing(_verify_and_update, password, password_hash)
+
+
+def create_access_token(*, user_id: int, profile_claims: dict | None = None) -> str:
     now = datetime.now(UTC)
     exp = now + timedelta(minutes=settings.access_token_expire_minutes)
     payload = {
+        **(profile_claims or {}),
         "sub": str(user_id),
         "type": "access",
         "iat": int(now.timestamp()),
@@ -32,11 +132,8 @@ def create_access_token(*, user_id: int) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
-def decode_access_token(token: str) -> int:
-    try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
-    except JWTError as exc:
-        raise ValueError("Invalid token") from exc
+def decode_access_claims(token: str) -> dict:
+    payload = verify_jwt(token)
 
     if payload.get("type") != "access":
         raise ValueError("Invalid token type")
@@ -44,7 +141,11 @@ def decode_access_token(token: str) -> int:
     sub = payload.get("sub")
     if not sub or not str(sub).isdigit():
         raise ValueError("Invalid token subject")
-    return int(sub)
+    return payload
+
+
+def decode_access_token(token: str) -> int:
+    return int(decode_access_claims(token)["sub"])
 
 
 def _pepper() -> bytes:
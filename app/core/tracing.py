@@ -0,0 +1,218 @@
+"""Minimal opt-in tracing that writes OpenTelemetry (OTLP/JSON) spans.
+
+Spans nest through a context variable: the request middleware opens a server span whose trace id
+is derived from X-Request-ID, and anything traced while the request runs (services, SQL) becomes
+its child. Finished spans are batched on a background thread and either appended to a file, one
+ExportTraceServiceRequest per line, or POSTed to an OTLP/HTTP collector's /v1/traces.
+"""
+
+import atexit
+import functools
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+
+from app.core.config import settings
+
+
+logger = logging.getLogger("app.tracing")
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+_STATUS_ERROR = 2
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+_SHUTDOWN = object()
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error", "_token")
+
+    def __init__(self, name: str, *, trace_id: str, parent_id: str | None, kind: int, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+        self.error = None
+        self._token = None
+
+    def to_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items() if value is not None],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error:
+            span["status"] = {"code": _STATUS_ERROR, "message": self.error}
+        return span
+
+
+def _otlp_attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class _BatchExporter:
+    def __init__(self):
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def submit(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def shutdown(self) -> None:
+        self._queue.put(_SHUTDOWN)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        batch: list[Span] = []
+        deadline = time.monotonic() + settings.tracing_flush_seconds
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Empty:
+                item = None
+            if item is _SHUTDOWN:
+                self._export(batch)
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= settings.tracing_batch_size or time.monotonic() >= deadline:
+                self._export(batch)
+                batch = []
+                deadline = time.monotonic() + settings.tracing_flush_seconds
+
+    def _export(self, spans: list[Span]) -> None:
+        if not spans:
+            return
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_otlp_attribute("service.name", settings.tracing_service_name)]},
+                    "scopeSpans": [{"scope": {"name": "app"}, "spans": [span.to_otlp() for span in spans]}],
+                }
+            ]
+        }
+        try:
+            if settings.tracing_exporter == "otlp":
+                requests.post(settings.tracing_otlp_endpoint, json=payload, timeout=5).raise_for_status()
+            else:
+                with open(settings.tracing_file_path, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(payload) + "\n")
+        except Exception:
+            logger.exception("Span export failed spans=%d", len(spans))
+
+
+_exporter: _BatchExporter | None = None
+_exporter_lock = threading.Lock()
+
+
+def _get_exporter() -> _BatchExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                _exporter = _BatchExporter()
+    return _exporter
+
+
+def trace_id_for_request(request_id: str) -> str:
+    """A W3C-sized trace id: the UUID itself when X-Request-ID is one, otherwise a hash of it."""
+    try:
+        return uuid.UUID(request_id).hex
+    except ValueError:
+        return hashlib.sha256(request_id.encode("utf-8")).hexdigest()[:32]
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def start_span(name: str, *, kind: int = SPAN_KIND_INTERNAL, trace_id: str | None = None, **attributes) -> Span | None:
+    """Open a span as a child of the current one; returns None when tracing is disabled."""
+    if not settings.tracing_enabled:
+        return None
+    parent = _current_span.get()
+    if trace_id is None:
+        trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+    span = Span(
+        name,
+        trace_id=trace_id,
+        parent_id=parent.span_id if parent is not None else None,
+        kind=kind,
+        attributes=attributes,
+    )
+    span._token = _current_span.set(span)
+    return span
+
+
+def end_span(span: Span | None, *, error: BaseException | str | None = None) -> None:
+    if span is None:
+        return
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+    try:
+        _current_span.reset(span._token)
+    except ValueError:
+        # Ended from a different context than it started in; the span itself is still valid.
+        pass
+    _get_exporter().submit(span)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    opened = start_span(name, **attributes)
+    try:
+        yield opened
+    except BaseException as exc:
+        end_span(opened, error=exc)
+        raise
+    end_span(opened)
+
+
+def traced(name: str | None = None):
+    """Decorator: run the function inside a span named after it."""
+
+    def decorate(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not settings.tracing_enabled:
+                return fn(*args, **kwargs)
+            with span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
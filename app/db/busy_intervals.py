@@ -0,0 +1,68 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+# Slices every non-cancelled meeting into one row per participant per calendar day, with
+# minute offsets from that day's midnight. Day boundaries follow the session TimeZone, the
+# same zone psycopg2 uses for the datetimes recommendations slice in Python.
+_BUSY_INTERVAL_ROWS = """
+    SELECT
+        participant.user_id,
+        day_start::date AS day,
+        m.id AS meeting_id,
+        FLOOR(EXTRACT(EPOCH FROM GREATEST(m.start_time, day_start) - day_start) / 60)::int AS start_minute,
+        FLOOR(EXTRACT(EPOCH FROM LEAST(m.end_time, day_start + INTERVAL '1 day') - day_start) / 60)::int AS end_minute
+    FROM meetings m
+    CROSS JOIN LATERAL (
+        SELECT m.created_by AS user_id
+        UNION
+        SELECT ma.user_id
+        FROM meeting_attendees ma
+        WHERE ma.meeting_id = m.id AND ma.status IN ('invited', 'accepted', 'maybe')
+    ) participant
+    CROSS JOIN LATERAL generate_series(date_trunc('day', m.start_time), m.end_time, INTERVAL '1 day') AS day_start
+    WHERE m.status <> 'cancelled'
+      AND participant.user_id IS NOT NULL
+      AND LEAST(m.end_time, day_start + INTERVAL '1 day') > GREATEST(m.start_time, day_start)
+"""
+
+
+def refresh_meeting_busy_intervals(meeting_id: int, db: Session) -> None:
+    """Re-materialize one meeting's busy rows. Call inside the transaction that changed the meeting."""
+    db.execute(
+        text("DELETE FROM user_busy_intervals WHERE meeting_id = :meeting_id"),
+        {"meeting_id": meeting_id},
+    )
+    db.execute(
+        text(
+            f"""
+            INSERT INTO user_busy_intervals (user_id, day, meeting_id, start_minute, end_minute)
+            {_BUSY_INTERVAL_ROWS}
+              AND m.id = :meeting_id
+            """
+        ),
+        {"meeting_id": meeting_id},
+    )
+
+
+def rebuild_busy_intervals(db: Session) -> None:
+    db.execute(text("TRUNCATE TABLE user_busy_intervals"))
+    db.execute(
+        text(
+            f"""
+            INSERT INTO user_busy_intervals (user_id, day, meeting_id, start_minute, end_minute)
+            {_BUSY_INTERVAL_ROWS}
+            """
+        )
+    )
+    db.commit()
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        rebuild_busy_intervals(session)
+    finally:
+        session.close()
@@ -0,0 +1,228 @@
+import logging
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.session import engine
+
+
+logger = logging.getLogger("app.migrations")
+
+
+# (version, name, statements). Versions are applied once, in order, and recorded in
+# schema_migrations; append new entries rather than editing applied ones. Statements stay
+# idempotent so databases created from db/schema.sql can record them on first run.
+MIGRATIONS: list[tuple[int, str, list[str]]] = [
+    (
+        1,
+        "meeting and attendee columns",
+        [
+            "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS description TEXT",
+            "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS meeting_type TEXT NOT NULL DEFAULT 'in_person'",
+            "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS color TEXT NOT NULL DEFAULT '#3498db'",
+            "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'confirmed'",
+            (
+                "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS created_by "
+                "INTEGER REFERENCES users(id) ON DELETE SET NULL"
+            ),
+            "ALTER TABLE meetings ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()",
+            "ALTER TABLE meeting_attendees ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()",
+            """
+            DO $$
+            DECLARE constraint_name TEXT;
+            BEGIN
+                SELECT c.conname INTO constraint_name
+                FROM pg_constraint c
+                JOIN pg_class t ON t.oid = c.conrelid
+                WHERE t.relname = 'meeting_attendees'
+                  AND c.contype = 'c'
+                  AND pg_get_constraintdef(c.oid) LIKE '%status%'
+                LIMIT 1;
+
+                IF constraint_name IS NOT NULL THEN
+                    EXECUTE format('ALTER TABLE meeting_attendees DROP CONSTRAINT %I', constraint_name);
+                END IF;
+
+                ALTER TABLE meeting_attendees
+                ADD CONSTRAINT meeting_attendees_status_check
+                CHECK (status IN ('invited', 'accepted', 'declined', 'maybe'));
+            EXCEPTION
+                WHEN duplicate_object THEN NULL;
+            END $$
+            """,
+        ],
+    ),
+    (
+        2,
+        "notification tables",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS notification_preferences (
+                user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+                email_enabled BOOLEAN NOT NULL DEFAULT TRUE,
+                in_app_enabled BOOLEAN NOT NULL DEFAULT TRUE,
+                meeting_reminders_enabled BOOLEAN NOT NULL DEFAULT TRUE,
+                group_activity_enabled BOOLEAN NOT NULL DEFAULT TRUE,
+                weekly_digest_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+                digest_frequency TEXT NOT NULL DEFAULT 'weekly' CHECK (digest_frequency IN ('daily', 'weekly')),
+                quiet_hours_enabled BOOLEAN NOT NULL DEFAULT FALSE,
+                quiet_hours_start TIME,
+                quiet_hours_end TIME,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS notifications (
+                id BIGSERIAL PRIMARY KEY,
+                user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                meeting_id INTEGER REFERENCES meetings(id) ON DELETE CASCADE,
+                channel TEXT NOT NULL CHECK (channel IN ('email', 'in_app')),
+                type TEXT NOT NULL CHECK (type IN ('invite', 'cancel', 'update', 'rsvp_update')),
+                title TEXT NOT NULL,
+                message TEXT NOT NULL,
+                status TEXT NOT NULL CHECK (status IN ('pending', 'sent', 'failed', 'read', 'skipped')),
+                provider_message_id TEXT,
+                error_message TEXT,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                sent_at TIMESTAMPTZ,
+                read_at TIMESTAMPTZ
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_notification_preferences_user_id ON notification_preferences(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications(user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_notifications_meeting_id ON notifications(meeting_id)",
+        ],
+    ),
+    (
+        3,
+        "user busy intervals",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS user_busy_intervals (
+                user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+                day DATE NOT NULL,
+                meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+                start_minute SMALLINT NOT NULL,
+                end_minute SMALLINT NOT NULL,
+                PRIMARY KEY (user_id, day, meeting_id)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_user_busy_intervals_meeting_id ON user_busy_intervals(meeting_id)",
+        ],
+    ),
+    (
+        4,
+        "meeting keyset pagination indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_meetings_start_time_id ON meetings(start_time, id)",
+            "CREATE INDEX IF NOT EXISTS idx_meetings_created_by_start_time_id ON meetings(created_by, start_time, id)",
+            "CREATE INDEX IF NOT EXISTS idx_meetings_calendar_id_start_time_id ON meetings(calendar_id, start_time, id)",
+        ],
+    ),
+    (
+        5,
+        "notification email outbox",
+        [
+            "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0",
+            "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ",
+            """
+            CREATE INDEX IF NOT EXISTS idx_notifications_email_outbox
+            ON notifications(next_attempt_at, id)
+            WHERE status = 'pending' AND channel = 'email'
+            """,
+        ],
+    ),
+    (
+        6,
+        "refresh token expiry indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens(expires_at)",
+            "CREATE INDEX IF NOT EXISTS idx_refresh_tokens_revoked_at ON refresh_tokens(revoked_at) WHERE revoked_at IS NOT NULL",
+        ],
+    ),
+    (
+        7,
+        "meeting time ranges",
+        [
+            # Rewrites meetings once; overlap queries then use `time_range && tstzrange(...)`.
+            """
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS time_range TSTZRANGE
+            GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_meetings_time_range_active
+            ON meetings USING GIST (time_range)
+            WHERE status <> 'cancelled'
+            """,
+        ],
+    ),
+]
+
+# Serializes migrating workers across processes and hosts; any constant unique to this app works.
+_MIGRATION_LOCK_KEY = 4_815_162_342
+
+_CREATE_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+"""
+
+
+def _applied_versions(conn) -> set[int] | None:
+    try:
+        return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+    except ProgrammingError:
+        conn.rollback()
+        return None
+
+
+def run_migrations() -> int:
+    """Apply pending migrations and return how many ran. A current schema costs one SELECT."""
+    required = {version for version, _, _ in MIGRATIONS}
+    migration_engine = engine
+    if settings.migrations_database_url:
+        migration_engine = create_engine(settings.migrations_database_url, poolclass=NullPool)
+    with migration_engine.connect() as conn:
+        applied = _applied_versions(conn)
+        conn.rollback()
+        if applied is not None and required <= applied:
+            return 0
+
+        conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            conn.execute(text(_CREATE_VERSION_TABLE))
+            conn.commit()
+            # Another worker may have migrated while this one waited for the lock.
+            applied = _applied_versions(conn) or set()
+            count = 0
+            for version, name, statements in MIGRATIONS:
+                if version in applied:
+                    continue
+                try:
+                    for statement in statements:
+                        conn.execute(text(statement))
+                    conn.execute(
+                        text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                        {"version": version, "name": name},
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                logger.info("Applied schema migration version=%s name=%s", version, name)
+                count += 1
+            return count
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK_KEY})
+            conn.commit()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Applied {run_migrations()} migration(s)")
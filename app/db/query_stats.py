@@ -0,0 +1,86 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.tracing import SPAN_KIND_CLIENT, current_span, end_span, start_span
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryStats:
+    """Statements executed on behalf of one request, filled in by the engine hooks below."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run more than `threshold` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+# Holds a mutable QueryStats rather than counters so updates made from the threadpool that runs
+# sync endpoints (which works on a copy of the context) are still seen by the middleware.
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def begin_query_stats() -> QueryStats:
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+# The same hooks open a client span per statement while a traced request is running.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+    if settings.tracing_enabled and current_span() is not None:
+        sql_span = start_span(
+            statement.split(None, 1)[0].upper() if statement.strip() else "SQL",
+            kind=SPAN_KIND_CLIENT,
+            **{"db.system": "postgresql", "db.statement": _WHITESPACE.sub(" ", statement).strip()[:2000]},
+        )
+        conn.info.setdefault("query_spans", []).append(sql_span)
+
+
+def _finish(conn, statement: str, error: BaseException | None = None) -> None:
+    spans = conn.info.get("query_spans")
+    if spans:
+        end_span(spans.pop(), error=error)
+    stats = _current_stats.get()
+    started = conn.info.get("query_start_times")
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish(conn, statement)
+
+
+def _handle_error(exception_context):
+    if exception_context.connection is not None:
+        _finish(exception_context.connection, exception_context.statement or "", exception_context.original_exception)
+
+
+def install_query_stats(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
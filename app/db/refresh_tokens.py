@@ -0,0 +1,161 @@
+from datetime import UTC, date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+# Revokes the presented token and issues its replacement in one statement. The UPDATE only
+# matches a live token of an active user, so two concurrent refreshes cannot both rotate it.
+_ROTATE_REFRESH_TOKEN = """
+    WITH rotated AS (
+        UPDATE refresh_tokens rt
+        SET revoked_at = NOW(), replaced_by_token_hash = :new_token_hash
+        FROM users u
+        WHERE rt.token_hash = :token_hash
+          AND rt.revoked_at IS NULL
+          AND rt.expires_at > NOW()
+          AND u.id = rt.user_id
+          AND u.is_active
+        RETURNING rt.user_id
+    ),
+    issued AS (
+        INSERT INTO refresh_tokens (user_id, token_hash, expires_at, user_agent, ip_address)
+        SELECT user_id, :new_token_hash, NOW() + make_interval(days => :expire_days), :user_agent, :ip_address
+        FROM rotated
+        RETURNING user_id
+    )
+    SELECT user_id FROM issued
+"""
+
+_PURGE_BATCH = """
+    DELETE FROM refresh_tokens
+    WHERE id IN (
+        SELECT id
+        FROM refresh_tokens
+        WHERE expires_at < NOW() - make_interval(hours => :retention_hours)
+           OR revoked_at < NOW() - make_interval(hours => :retention_hours)
+        LIMIT :batch_size
+    )
+"""
+
+PARTITION_PREFIX = "refresh_tokens_p"
+
+
+def rotate_refresh_token(
+    db: Session,
+    *,
+    token_hash: str,
+    new_token_hash: str,
+    user_agent: str | None,
+    ip_address: str | None,
+) -> int | None:
+    """Rotate a live refresh token; returns the owner's id, or None when the token can't be used."""
+    return db.execute(
+        text(_ROTATE_REFRESH_TOKEN),
+        {
+            "token_hash": token_hash,
+            "new_token_hash": new_token_hash,
+            "expire_days": settings.refresh_token_expire_days,
+            "user_agent": user_agent,
+            "ip_address": ip_address,
+        },
+    ).scalar_one_or_none()
+
+
+def purge_refresh_tokens(db: Session, *, batch_size: int | None = None, retention_hours: int | None = None) -> int:
+    """Delete expired and revoked tokens in short batches, committing after each one."""
+    params = {
+        "batch_size": batch_size or settings.refresh_token_purge_batch_size,
+        "retention_hours": settings.refresh_token_retention_hours if retention_hours is None else retention_hours,
+    }
+    total = 0
+    while True:
+        deleted = db.execute(text(_PURGE_BATCH), params).rowcount
+        db.commit()
+        total += deleted
+        if deleted < params["batch_size"]:
+            return total
+
+
+def _is_partitioned(db: Session) -> bool:
+    return bool(
+        db.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'refresh_tokens'::regclass)")
+        ).scalar()
+    )
+
+
+def _month_start(day: date, offset: int = 0) -> date:
+    month_index = day.year * 12 + day.month - 1 + offset
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def ensure_refresh_token_partitions(db: Session, *, months_ahead: int = 3) -> None:
+    """Create monthly expires_at partitions from this month through `months_ahead` (partitioned tables only)."""
+    if not _is_partitioned(db):
+        return
+    today = datetime.now(UTC).date()
+    for offset in range(months_ahead + 1):
+        start = _month_start(today, offset)
+        end = _month_start(today, offset + 1)
+        db.execute(
+            text(
+                f"""
+                CREATE TABLE IF NOT EXISTS {PARTITION_PREFIX}{start:%Y%m}
+                PARTITION OF refresh_tokens
+                FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')
+                """
+            )
+        )
+    db.commit()
+
+
+def drop_expired_refresh_token_partitions(db: Session) -> list[str]:
+    """Drop monthly partitions whose every token expired more than the retention window ago."""
+    if not _is_partitioned(db):
+        return []
+    cutoff = datetime.now(UTC).date()
+    names = db.execute(
+        text(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'refresh_tokens'::regclass
+              AND c.relname ~ :pattern
+            ORDER BY c.relname
+            """
+        ),
+        {"pattern": f"^{PARTITION_PREFIX}[0-9]{{6}}$"},
+    ).scalars().all()
+
+    dropped = []
+    for name in names:
+        start = date(int(name[-6:-2]), int(name[-2:]), 1)
+        end = _month_start(start, 1)
+        if (cutoff - end).days * 24 < settings.refresh_token_retention_hours:
+            continue
+        db.execute(text(f"ALTER TABLE refresh_tokens DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    db.commit()
+    return dropped
+
+
+def run_refresh_token_maintenance(db: Session) -> dict:
+    ensure_refresh_token_partitions(db)
+    dropped = drop_expired_refresh_token_partitions(db)
+    purged = purge_refresh_tokens(db)
+    return {"dropped_partitions": dropped, "purged_rows": purged}
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(run_refresh_token_maintenance(session))
+    finally:
+        session.close()
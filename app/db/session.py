@@ -1,8 +1,135 @@
-from sqlalchemy import create_engine
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, exc, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
 from app.core.config import settings
+from app.db.query_stats import install_query_stats
+
+
+class PoolCheckoutMetrics:
+    """Process-wide counters for time spent waiting on pool checkouts (including any pre-ping)."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += int(timed_out)
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+pool_checkout_metrics = PoolCheckoutMetrics()
+
+
+class _TimedCheckoutMixin:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_checkout_metrics.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_checkout_metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
 
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+def _pool_kwargs(poolclass) -> dict:
+    # Pool sizes are per engine, i.e. per worker process: N workers may hold up to
+    # N * (db_pool_size + db_max_overflow) server connections.
+    if settings.db_pool_size <= 0:
+        return {"poolclass": NullPool, "pool_pre_ping": settings.db_pool_pre_ping}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+    }
+
+
+engine = create_engine(settings.database_url, **_pool_kwargs(TimedQueuePool))
+install_query_stats(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    url = make_url(settings.database_url).set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def _async_connect_args() -> dict:
+    if not settings.db_pgbouncer_transaction_mode:
+        return {}
+    # PgBouncer in transaction mode hands each transaction to whichever server connection is
+    # free, so asyncpg's named prepared statements would be missing (or clash) on the next one.
+    # psycopg2 never prepares server-side and needs nothing here.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+# The async engine is opt-in so asyncpg is only imported when it is actually used.
+async_engine = None
+AsyncSessionLocal = None
+if settings.async_db_enabled:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        _async_database_url(),
+        connect_args=_async_connect_args(),
+        **_pool_kwargs(TimedAsyncAdaptedQueuePool),
+    )
+    install_query_stats(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+def _queue_pool_stats(pool) -> dict[str, int]:
+    if not isinstance(pool, QueuePool):
+        return {"size": 0, "checked_in": 0, "checked_out": 0, "overflow": 0}
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+def pool_stats() -> dict[str, dict]:
+    """Current in-use counts for each engine's pool plus the shared checkout wait counters."""
+    stats = {"sync": _queue_pool_stats(engine.pool), "checkout": pool_checkout_metrics.stats()}
+    if async_engine is not None:
+        stats["async"] = _queue_pool_stats(async_engine.pool)
+    return stats
@@ -2,24 +2,39 @@ import logging
 import time
 import uuid
 
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, Request
+import anyio
+
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.api.auth import router as auth_router
 from app.api.availability import router as availability_router
 from app.api.calendar import router as calendar_router
 from app.api.meetings import router as meetings_router
 from app.api.notifications import router as notifications_router
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
-from app.core.logging import configure_logging
-from app.db.bootstrap import ensure_runtime_schema
+from app.core.jwt_verifier import verified_token_cache
+from app.core.logging import configure_logging, request_id_var
+from app.core.metrics import CONTENT_TYPE, http_requests_in_flight, observe_request, register_collector, render_metrics
+from app.core.profiling import StackSampler, should_profile, write_profile
+from app.core.security import PasswordHashingBusy, password_hashing_stats, shutdown_password_hashing
+from app.core.tracing import SPAN_KIND_SERVER, end_span, start_span, trace_id_for_request
+from app.db.migrations import run_migrations
+from app.db.query_stats import begin_query_stats
+from app.db.session import pool_stats
 from app.models import User
+from app.services.group_availability import group_availability_heatmap
+from app.services.recommendations import MINUTES_PER_DAY, weekly_availability_cache
 from app.schemas.groups import (
     CreateGroupRequest,
+    GroupAvailabilityHeatmapResponse,
     GroupAvailabilityResponse,
     GroupAvailabilitySlotResponse,
     GroupMemberActionResponse,
@@ -30,12 +45,16 @@ from app.schemas.groups import (
     TransferOwnershipRequest,
 )
 
-from app.api.deps import get_current_user, get_db, require_group_role
+from app.api.deps import active_user_cache, get_async_db, get_current_user, get_current_user_async, get_db
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
 
-configure_logging(settings.log_level)
+configure_logging(
+    settings.log_level,
+    json_format=settings.log_format == "json",
+    info_sample_rate=settings.log_info_sample_rate,
+)
 logger = logging.getLogger("app")
 
 
@@ -50,33 +69,182 @@ def _allowed_origins() -> list[str]:
         origins.add(settings.frontend_origin)
     return sorted(origins)
 
+def _runtime_metrics():
+    pools = pool_stats()
+    checkout = pools.pop("checkout")
+    for field in ("size", "checked_out", "checked_in", "overflow"):
+        yield (
+            f"db_pool_{field}",
+            "gauge",
+            f"Connection pool {field.replace('_', ' ')} per engine.",
+            [({"engine": name}, stats[field]) for name, stats in pools.items()],
+        )
+    yield "db_pool_checkouts_total", "counter", "Pool checkouts.", [({}, checkout["checkouts"])]
+    yield "db_pool_checkout_timeouts_total", "counter", "Pool checkouts that timed out.", [({}, checkout["timeouts"])]
+    yield (
+        "db_pool_checkout_wait_seconds_total",
+        "counter",
+        "Time spent waiting for pool checkouts, including pre-ping.",
+        [({}, checkout["wait_seconds_total"])],
+    )
+    yield "db_pool_checkout_wait_seconds_max", "gauge", "Longest pool checkout wait.", [({}, checkout["wait_seconds_max"])]
+
+    caches = {
+        "weekly_availability": weekly_availability_cache.stats(),
+        "active_user": active_user_cache.stats(),
+        "jwt_verify": verified_token_cache.stats(),
+    }
+    for field, kind in (("size", "gauge"), ("hits", "counter"), ("misses", "counter"), ("evictions", "counter")):
+        name = f"cache_{field}" if kind == "gauge" else f"cache_{field}_total"
+        yield name, kind, f"In-process cache {field}.", [({"cache": cache}, stats[field]) for cache, stats in caches.items()]
+
+    hashing = password_hashing_stats()
+    yield "password_hashing_in_flight", "gauge", "Password hashes queued or running.", [({}, hashing["in_flight"])]
+    yield "password_hashing_workers", "gauge", "Password hashing worker processes.", [({}, hashing["workers"])]
+
+
+register_collector(_runtime_metrics)
+
+
 def create_app() -> FastAPI:
     api = FastAPI(title="AI Agents API")
 
     @api.on_event("startup")
-    def bootstrap_runtime_schema() -> None:
-        ensure_runtime_schema()
+    def apply_schema_migrations() -> None:
+        if settings.run_migrations_on_startup:
+            run_migrations()
+
+    @api.on_event("startup")
+    async def check_password_hashing_capacity() -> None:
+        threadpool_size = anyio.to_thread.current_default_thread_limiter().total_tokens
+        hashing_threads = settings.password_hash_workers + settings.password_hash_max_queue
+        if settings.password_hash_workers > 0 and hashing_threads > threadpool_size // 4:
+            logger.warning(
+                "Password hashing can hold %d of %d threadpool threads; lower PASSWORD_HASH_MAX_QUEUE",
+                hashing_threads,
+                threadpool_size,
+            )
+
+    @api.on_event("shutdown")
+    def stop_password_hashing() -> None:
+        shutdown_password_hashing()
+
+    if settings.profiling_enabled:
+        # Registered before request_logging, so it runs inside it and sees the request id.
+        @api.middleware("http")
+        async def request_profiling(request: Request, call_next):
+            if not should_profile(request.headers.get("x-profile")):
+                return await call_next(request)
+
+            sampler = StackSampler(settings.profiling_interval_ms / 1000.0)
+            sampler.start()
+            try:
+                response = await call_next(request)
+            finally:
+                # stop() joins the sampler thread, which can take up to one interval.
+                await run_in_threadpool(sampler.stop)
+            route = request.scope.get("route")
+            profile_name = await run_in_threadpool(
+                write_profile,
+                sampler,
+                request_id=request.state.request_id,
+                label=f"{request.method} {getattr(route, 'path', request.url.path)}",
+            )
+            response.headers["X-Profile-Id"] = profile_name
+            return response
 
     @api.middleware("http")
     async def request_logging(request: Request, call_next):
         request_id = request.headers.get("x-request-id") or str(uuid.uuid4())
         request.state.request_id = request_id
+        request_id_var.set(request_id)
 
         start = time.perf_counter()
-        response = await call_next(request)
+        query_stats = begin_query_stats()
+        request_span = start_span(
+            f"{request.method} {request.url.path}",
+            kind=SPAN_KIND_SERVER,
+            trace_id=trace_id_for_request(request_id),
+            **{"http.request.method": request.method, "url.path": request.url.path, "request.id": request_id},
+        )
+        status_code = 500
+        error = None
+        http_requests_in_flight.inc()
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            http_requests_in_flight.dec()
+            # Label by route template so /meetings/1 and /meetings/2 share a series.
+            route = request.scope.get("route")
+            observe_request(
+                request.method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start,
+            )
+            if request_span is not None:
+                if route is not None:
+                    request_span.name = f"{request.method} {route.path}"
+                    request_span.attributes["http.route"] = route.path
+                request_span.attributes["http.response.status_code"] = status_code
+                end_span(request_span, error=error or (f"HTTP {status_code}" if status_code >= 500 else None))
         duration_ms = (time.perf_counter() - start) * 1000.0
+        db_ms = query_stats.seconds * 1000.0
 
         response.headers["X-Request-ID"] = request_id
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{query_stats.count} queries", total;dur={duration_ms:.1f}'
+        )
         logger.info(
-            "%s %s -> %s %.1fms request_id=%s",
+            "%s %s -> %s %.1fms db_queries=%d db_ms=%.1f request_id=%s",
             request.method,
             request.url.path,
             response.status_code,
             duration_ms,
+            query_stats.count,
+            db_ms,
             request_id,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "route": getattr(request.scope.get("route"), "path", None),
+                "status": response.status_code,
+                "duration_ms": round(duration_ms, 1),
+                "db_queries": query_stats.count,
+                "db_ms": round(db_ms, 1),
+                "sampled": response.status_code < 400,
+            },
         )
+        threshold = settings.sql_repeated_statement_warning_threshold
+        if threshold > 0:
+            for statement, count in query_stats.repeated(threshold):
+                logger.warning(
+                    "Statement ran %d times in %s %s (possible N+1) request_id=%s: %s",
+                    count,
+                    request.method,
+                    request.url.path,
+                    request_id,
+                    statement[:500],
+                )
         return response
 
+    if settings.metrics_enabled:
+        @api.get("/metrics", include_in_schema=False)
+        def metrics() -> Response:
+            return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+    @api.exception_handler(PasswordHashingBusy)
+    async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Authentication is busy, please retry"},
+            headers={"Retry-After": "1"},
+        )
+
     @api.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
         request_id = getattr(request.state, "request_id", None) or str(uuid.uuid4())
@@ -98,6 +266,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
 
     api.include_router(auth_router)
@@ -126,48 +295,44 @@ def get_user_groups(current_user: User = Depends(get_current_user), db: Session
     return [dict(row) for row in result]
 
 
+# Each group read is one round trip: the caller's membership, the group row and the payload rows
+# come back together. The anchor row guarantees a result even when the group or membership is
+# missing, and member rows are only joined for members, so outsiders learn nothing beyond 403/404.
+_GROUP_DETAIL_QUERY = text(
+    """
+    WITH viewer AS (
+        SELECT role FROM group_memberships WHERE group_id = :group_id AND user_id = :user_id
+    )
+    SELECT
+        (SELECT role FROM viewer) AS viewer_role,
+        g.id AS group_id,
+        g.name AS group_name,
+        g.description AS group_description,
+        u.id,
+        u.first_name,
+        u.last_name,
+        u.email,
+        gm.role
+    FROM (SELECT 1) anchor
+    LEFT JOIN groups g ON g.id = :group_id
+    LEFT JOIN group_memberships gm ON gm.group_id = g.id AND EXISTS (SELECT 1 FROM viewer)
+    LEFT JOIN users u ON u.id = gm.user_id
+    ORDER BY gm.role = 'owner' DESC, u.first_name, u.last_name
+    """
+)
+
+
 @router.get("/{group_id}", response_model=GroupDetailResponse)
 def get_group_detail(group_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    membership = db.execute(
-        text(
-            """
-            SELECT gm.role
-            FROM group_memberships gm
-            WHERE gm.group_id = :group_id AND gm.user_id = :user_id
-            """
-        ),
-        {"group_id": group_id, "user_id": current_user.id},
-    ).mappings().one_or_none()
+    rows = db.execute(_GROUP_DETAIL_QUERY, {"group_id": group_id, "user_id": current_user.id}).mappings().all()
+    head = rows[0]
 
-    if membership is None:
+    if head["viewer_role"] is None:
         raise HTTPException(status_code=403, detail="Not a member of this group")
 
-    group_row = db.execute(
-        text("SELECT id, name, description FROM groups WHERE id = :group_id"),
-        {"group_id": group_id},
-    ).mappings().one_or_none()
-
-    if group_row is None:
+    if head["group_id"] is None:
         raise HTTPException(status_code=404, detail="Group not found")
 
-    members = db.execute(
-        text(
-            """
-            SELECT
-                u.id,
-                u.first_name,
-                u.last_name,
-                u.email,
-                gm.role
-            FROM group_memberships gm
-            JOIN users u ON u.id = gm.user_id
-            WHERE gm.group_id = :group_id
-            ORDER BY gm.role = 'owner' DESC, u.first_name, u.last_name
-            """
-        ),
-        {"group_id": group_id},
-    ).mappings().all()
-
     member_payload = [
         GroupMemberResponse(
             id=row["id"],
@@ -176,68 +341,58 @@ def get_group_detail(group_id: int, current_user: User = Depends(get_current_use
             email=row["email"],
             role=row["role"],
         )
-        for row in members
+        for row in rows
+        if row["id"] is not None
     ]
 
     return GroupDetailResponse(
-        id=group_row["id"],
-        name=group_row["name"],
-        description=group_row["description"],
-        role=membership["role"],
+        id=head["group_id"],
+        name=head["group_name"],
+        description=head["group_description"],
+        role=head["viewer_role"],
         memberCount=len(member_payload),
         members=member_payload,
     )
 
 
-@router.get("/{group_id}/availability", response_model=GroupAvailabilityResponse)
-def get_group_availability(
-    group_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    group_row = db.execute(
-        text("SELECT id, name FROM groups WHERE id = :group_id"),
-        {"group_id": group_id},
-    ).mappings().one_or_none()
+_GROUP_AVAILABILITY_QUERY = text(
+    """
+    WITH viewer AS (
+        SELECT role FROM group_memberships WHERE group_id = :group_id AND user_id = :user_id
+    )
+    SELECT
+        (SELECT role FROM viewer) AS viewer_role,
+        g.id AS group_id,
+        g.name AS group_name,
+        u.id AS member_id,
+        u.first_name,
+        u.last_name,
+        u.email,
+        gm.role,
+        tsp.day_of_week,
+        tsp.start_time,
+        tsp.end_time
+    FROM (SELECT 1) anchor
+    LEFT JOIN groups g ON g.id = :group_id
+    LEFT JOIN group_memberships gm ON gm.group_id = g.id AND EXISTS (SELECT 1 FROM viewer)
+    LEFT JOIN users u ON u.id = gm.user_id
+    LEFT JOIN time_slot_preferences tsp ON tsp.user_id = u.id
+    ORDER BY gm.role = 'owner' DESC, u.first_name, u.last_name, tsp.day_of_week, tsp.start_time
+    """
+)
 
-    if group_row is None:
-        raise HTTPException(status_code=404, detail="Group not found")
 
-    membership = db.execute(
-        text(
-            """
-            SELECT role
-            FROM group_memberships
-            WHERE group_id = :group_id AND user_id = :user_id
-            """
-        ),
-        {"group_id": group_id, "user_id": current_user.id},
-    ).mappings().one_or_none()
+def _check_group_access(head) -> None:
+    if head["group_id"] is None:
+        raise HTTPException(status_code=404, detail="Group not found")
 
-    if membership is None:
+    if head["viewer_role"] is None:
         raise HTTPException(status_code=403, detail="Not a member of this group")
 
-    rows = db.execute(
-        text(
-            """
-            SELECT
-                u.id AS member_id,
-                u.first_name,
-                u.last_name,
-                u.email,
-                gm.role,
-                tsp.day_of_week,
-                tsp.start_time,
-                tsp.end_time
-            FROM group_memberships gm
-            JOIN users u ON u.id = gm.user_id
-            LEFT JOIN time_slot_preferences tsp ON tsp.user_id = u.id
-            WHERE gm.group_id = :group_id
-            ORDER BY gm.role = 'owner' DESC, u.first_name, u.last_name, tsp.day_of_week, tsp.start_time
-            """
-        ),
-        {"group_id": group_id},
-    ).mappings().all()
+
+def _group_availability_response(rows) -> GroupAvailabilityResponse:
+    head = rows[0]
+    _check_group_access(head)
 
     slot_payload = [
         GroupAvailabilitySlotResponse(
@@ -255,37 +410,130 @@ def get_group_availability(
     ]
 
     return GroupAvailabilityResponse(
-        groupId=group_row["id"],
-        groupName=group_row["name"],
+        groupId=head["group_id"],
+        groupName=head["group_name"],
         slots=slot_payload,
     )
 
 
+def get_group_availability(
+    group_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    rows = db.execute(_GROUP_AVAILABILITY_QUERY, {"group_id": group_id, "user_id": current_user.id}).mappings().all()
+    return _group_availability_response(rows)
+
+
+async def get_group_availability_async(
+    group_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    rows = (
+        await db.execute(_GROUP_AVAILABILITY_QUERY, {"group_id": group_id, "user_id": current_user.id})
+    ).mappings().all()
+    return _group_availability_response(rows)
+
+
+router.get("/{group_id}/availability", response_model=GroupAvailabilityResponse)(
+    get_group_availability_async if settings.async_db_enabled else get_group_availability
+)
+
+
+_GROUP_MEMBER_IDS_QUERY = text(
+    """
+    WITH viewer AS (
+        SELECT role FROM group_memberships WHERE group_id = :group_id AND user_id = :user_id
+    )
+    SELECT
+        (SELECT role FROM viewer) AS viewer_role,
+        g.id AS group_id,
+        g.name AS group_name,
+        u.id AS member_id
+    FROM (SELECT 1) anchor
+    LEFT JOIN groups g ON g.id = :group_id
+    LEFT JOIN group_memberships gm ON gm.group_id = g.id AND EXISTS (SELECT 1 FROM viewer)
+    LEFT JOIN users u ON u.id = gm.user_id
+    ORDER BY gm.role = 'owner' DESC, u.first_name, u.last_name, u.id
+    """
+)
+
+
+@router.get("/{group_id}/availability/heatmap", response_model=GroupAvailabilityHeatmapResponse)
+def get_group_availability_heatmap(
+    group_id: int,
+    increment_minutes: int = Query(30, ge=5, le=240),
+    include_members: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    # Cells must tile the day exactly, or the tail of every day would silently be dropped.
+    if MINUTES_PER_DAY % increment_minutes:
+        raise HTTPException(status_code=422, detail="increment_minutes must divide a day evenly")
+
+    rows = db.execute(_GROUP_MEMBER_IDS_QUERY, {"group_id": group_id, "user_id": current_user.id}).mappings().all()
+    head = rows[0]
+    _check_group_access(head)
+
+    member_ids = [row["member_id"] for row in rows if row["member_id"] is not None]
+    counts, member_bits = group_availability_heatmap(
+        member_ids,
+        db,
+        increment_minutes=increment_minutes,
+        include_member_bits=include_members,
+    )
+    return GroupAvailabilityHeatmapResponse(
+        groupId=head["group_id"],
+        groupName=head["group_name"],
+        incrementMinutes=increment_minutes,
+        memberIds=member_ids,
+        counts=counts,
+        memberBits=member_bits,
+    )
+
+
+# Owner check and target lookup in one statement: 403 for non-members and for members who are not the owner.
+_OWNER_AND_TARGET_ROLE_QUERY = text(
+    """
+    SELECT
+        MAX(role) FILTER (WHERE user_id = :user_id) AS caller_role,
+        MAX(role) FILTER (WHERE user_id = :target_id) AS target_role
+    FROM group_memberships
+    WHERE group_id = :group_id AND user_id IN (:user_id, :target_id)
+    """
+)
+
+
+def _require_owner_and_target_role(group_id: int, target_id: int, current_user: User, db: Session) -> str | None:
+    roles = db.execute(
+        _OWNER_AND_TARGET_ROLE_QUERY,
+        {"group_id": group_id, "user_id": current_user.id, "target_id": target_id},
+    ).mappings().one()
+
+    if roles["caller_role"] is None:
+        raise HTTPException(status_code=403, detail="Not a member of this group")
+    if roles["caller_role"] != "owner":
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    return roles["target_role"]
+
+
 @router.post("/{group_id}/transfer-ownership", response_model=GroupMemberActionResponse)
 def transfer_group_ownership(
     group_id: int,
     payload: TransferOwnershipRequest,
-    owner_membership=Depends(require_group_role("owner")),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    if payload.newOwnerId == owner_membership.user_id:
-        raise HTTPException(status_code=400, detail="This member is already the owner")
+    target_role = _require_owner_and_target_role(group_id, payload.newOwnerId, current_user, db)
 
-    target_membership = db.execute(
-        text(
-            """
-            SELECT user_id, role
-            FROM group_memberships
-            WHERE group_id = :group_id AND user_id = :user_id
-            """
-        ),
-        {"group_id": group_id, "user_id": payload.newOwnerId},
-    ).mappings().one_or_none()
+    if payload.newOwnerId == current_user.id:
+        raise HTTPException(status_code=400, detail="This member is already the owner")
 
-    if target_membership is None:
+    if target_role is None:
         raise HTTPException(status_code=404, detail="Target member not found in this group")
 
-    if target_membership["role"] == "owner":
+    if target_role == "owner":
         raise HTTPException(status_code=400, detail="This member is already the owner")
 
     db.execute(
@@ -296,7 +544,7 @@ def transfer_group_ownership(
             WHERE group_id = :group_id AND user_id = :current_owner_id
             """
         ),
-        {"group_id": group_id, "current_owner_id": owner_membership.user_id},
+        {"group_id": group_id, "current_owner_id": current_user.id},
     )
 
     db.execute(
@@ -318,27 +566,18 @@ def transfer_group_ownership(
 def remove_group_member(
     group_id: int,
     member_id: int,
-    owner_membership=Depends(require_group_role("owner")),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    if member_id == owner_membership.user_id:
-        raise HTTPException(status_code=400, detail="Owner cannot remove themselves")
+    target_role = _require_owner_and_target_role(group_id, member_id, current_user, db)
 
-    target_membership = db.execute(
-        text(
-            """
-            SELECT user_id, role
-            FROM group_memberships
-            WHERE group_id = :group_id AND user_id = :member_id
-            """
-        ),
-        {"group_id": group_id, "member_id": member_id},
-    ).mappings().one_or_none()
+    if member_id == current_user.id:
+        raise HTTPException(status_code=400, detail="Owner cannot remove themselves")
 
-    if target_membership is None:
+    if target_role is None:
         raise HTTPException(status_code=404, detail="Member not found in this group")
 
-    if target_membership["role"] == "owner":
+    if target_role == "owner":
         raise HTTPException(status_code=400, detail="Transfer ownership before removing this member")
 
     db.execute(
@@ -58,3 +58,14 @@ class GroupAvailabilityResponse(BaseModel):
     groupId: int
     groupName: str
     slots: list[GroupAvailabilitySlotResponse]
+
+
+class GroupAvailabilityHeatmapResponse(BaseModel):
+    groupId: int
+    groupName: str
+    incrementMinutes: int
+    memberIds: list[int]
+    # counts[day_of_week][cell]: members available for the whole cell starting at cell * incrementMinutes
+    counts: list[list[int]]
+    # Optional base64 bitsets per cell; bit i (little-endian within each byte) is memberIds[i]
+    memberBits: list[list[str]] | None = None
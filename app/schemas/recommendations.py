@@ -10,6 +10,7 @@ class RecommendationRequest(BaseModel):
     duration_minutes: int = Field(ge=15, le=480)
     max_results: int = Field(default=3, ge=1, le=10)
     include_organizer: bool = True
+    allow_partial: bool = False
 
     @model_validator(mode="after")
     def validate_window(self):
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+
+# Resend accepts at most this many messages per /emails/batch call.
+RESEND_BATCH_LIMIT = 100
+
+
+class ResendClient:
+    """Resend API client over one pooled keep-alive session, safe to share across dispatcher threads."""
+
+    def __init__(self, pool_size: int | None = None, timeout: float = 15):
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size or settings.notification_outbox_concurrency,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _post(self, path: str, payload) -> dict | list:
+        response = self._session.post(
+            f"{settings.resend_api_url.rstrip('/')}{path}",
+            headers={"Authorization": f"Bearer {settings.resend_api_key}"},
+            json=payload,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def _from_header() -> str:
+        if settings.email_from_name:
+            return f"{settings.email_from_name} <{settings.email_from_address}>"
+        return settings.email_from_address
+
+    def _email(self, recipient_email: str, subject: str, message: str) -> dict:
+        return {
+            "from": self._from_header(),
+            "to": [recipient_email],
+            "subject": subject,
+            "text": message,
+        }
+
+    def send(self, *, recipient_email: str, subject: str, message: str) -> str | None:
+        """Send one email and return the provider message id. Raises on failure."""
+        return self._post("/emails", self._email(recipient_email, subject, message)).get("id")
+
+    def send_batch(self, *, recipient_emails: list[str], subject: str, message: str) -> list[str | None]:
+        """Send the same message to each recipient in one request; ids come back in recipient order."""
+        if len(recipient_emails) > RESEND_BATCH_LIMIT:
+            raise ValueError(f"Resend batch is limited to {RESEND_BATCH_LIMIT} emails")
+        body = self._post("/emails/batch", [self._email(email, subject, message) for email in recipient_emails])
+        return [item.get("id") for item in body.get("data", [])]
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_client: ResendClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_resend_client() -> ResendClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ResendClient()
+        return _client
@@ -0,0 +1,35 @@
+import base64
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.services.recommendations import MINUTES_PER_DAY, load_weekly_availability, weekly_availability_mask
+
+
+def group_availability_heatmap(
+    member_ids: list[int],
+    db: Session,
+    *,
+    increment_minutes: int,
+    include_member_bits: bool = False,
+) -> tuple[list[list[int]], list[list[str]] | None]:
+    """Per-day-of-week, per-increment counts of members whose weekly availability covers the whole cell."""
+    availability_by_user = load_weekly_availability(member_ids, db)
+    cells_per_day = MINUTES_PER_DAY // increment_minutes
+
+    masks = np.zeros((len(member_ids), 7, MINUTES_PER_DAY), dtype=bool)
+    for index, member_id in enumerate(member_ids):
+        masks[index] = weekly_availability_mask(availability_by_user.get(member_id, {}))
+    covered = masks[:, :, : cells_per_day * increment_minutes].reshape(len(member_ids), 7, cells_per_day, increment_minutes)
+    available = covered.all(axis=3)
+
+    counts = available.sum(axis=0).tolist()
+    if not include_member_bits:
+        return counts, None
+
+    packed = np.packbits(available, axis=0, bitorder="little")
+    member_bits = [
+        [base64.b64encode(packed[:, day, cell].tobytes()).decode("ascii") for cell in range(cells_per_day)]
+        for day in range(7)
+    ]
+    return counts, member_bits
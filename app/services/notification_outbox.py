@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.services.email_client import RESEND_BATCH_LIMIT, get_resend_client
+
+
+logger = logging.getLogger("app.notifications.outbox")
+
+
+# Claims due email rows and pushes their next_attempt_at out by the lease, so a worker that dies
+# mid-batch only delays those rows. SKIP LOCKED lets several workers drain the outbox side by side.
+_CLAIM_PENDING_EMAILS = """
+    UPDATE notifications n
+    SET attempts = n.attempts + 1,
+        next_attempt_at = NOW() + make_interval(secs => :lease_seconds)
+    FROM users u
+    WHERE u.id = n.user_id
+      AND n.id IN (
+          SELECT id
+          FROM notifications
+          WHERE status = 'pending'
+            AND channel = 'email'
+            AND (next_attempt_at IS NULL OR next_attempt_at <= NOW())
+          ORDER BY next_attempt_at NULLS FIRST, id
+          LIMIT :batch_size
+          FOR UPDATE SKIP LOCKED
+      )
+    RETURNING n.id, n.title, n.message, n.attempts, u.email AS recipient_email
+"""
+
+
+def _group_by_message(rows) -> list[list[dict]]:
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for row in rows:
+        groups.setdefault((row["title"], row["message"]), []).append(row)
+    return [
+        group[offset:offset + RESEND_BATCH_LIMIT]
+        for group in groups.values()
+        for offset in range(0, len(group), RESEND_BATCH_LIMIT)
+    ]
+
+
+def _send(group: list[dict]) -> list[tuple[int, str | None, str | None]]:
+    client = get_resend_client()
+    try:
+        if len(group) == 1:
+            provider_message_ids = [
+                client.send(recipient_email=group[0]["recipient_email"], subject=group[0]["title"], message=group[0]["message"])
+            ]
+        else:
+            provider_message_ids = client.send_batch(
+                recipient_emails=[row["recipient_email"] for row in group],
+                subject=group[0]["title"],
+                message=group[0]["message"],
+            )
+        provider_message_ids += [None] * (len(group) - len(provider_message_ids))
+        return [(row["id"], provider_message_id, None) for row, provider_message_id in zip(group, provider_message_ids)]
+    except Exception as exc:
+        logger.exception("Email delivery failed notification_ids=%s", [row["id"] for row in group])
+        return [(row["id"], None, str(exc)) for row in group]
+
+
+def _retry_delay_seconds(attempts: int) -> float:
+    return settings.notification_outbox_backoff_seconds * (2 ** (attempts - 1))
+
+
+def dispatch_pending_notifications(db: Session, executor: ThreadPoolExecutor | None = None) -> int:
+    """Deliver one batch of pending email notifications. Returns the number of rows claimed."""
+    rows = db.execute(
+        text(_CLAIM_PENDING_EMAILS),
+        {
+            "lease_seconds": settings.notification_outbox_lease_seconds,
+            "batch_size": settings.notification_outbox_batch_size,
+        },
+    ).mappings().all()
+    db.commit()
+    if not rows:
+        return 0
+
+    # Recipients of an identical message share one batch request; distinct groups go out in parallel.
+    groups = _group_by_message(rows)
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=settings.notification_outbox_concurrency) as pool:
+            results = [result for group_results in pool.map(_send, groups) for result in group_results]
+    else:
+        results = [result for group_results in executor.map(_send, groups) for result in group_results]
+
+    # Each final write is guarded by the attempt count this worker claimed: if the lease expired
+    # mid-send and another worker re-claimed the row, that worker now owns the outcome.
+    attempts_by_id = {row["id"]: row["attempts"] for row in rows}
+    for notification_id, provider_message_id, error_message in results:
+        attempts = attempts_by_id[notification_id]
+        if error_message is None:
+            result = db.execute(
+                text(
+                    """
+                    UPDATE notifications
+                    SET status = 'sent', provider_message_id = :provider_message_id,
+                        error_message = NULL, next_attempt_at = NULL, sent_at = :sent_at
+                    WHERE id = :id AND status = 'pending' AND attempts = :claimed_attempts
+                    """
+                ),
+                {
+                    "id": notification_id,
+                    "claimed_attempts": attempts,
+                    "provider_message_id": provider_message_id,
+                    "sent_at": datetime.now(timezone.utc),
+                },
+            )
+        elif attempts >= settings.notification_outbox_max_attempts:
+            result = db.execute(
+                text(
+                    """
+                    UPDATE notifications
+                    SET status = 'failed', error_message = :error_message, next_attempt_at = NULL
+                    WHERE id = :id AND status = 'pending' AND attempts = :claimed_attempts
+                    """
+                ),
+                {"id": notification_id, "claimed_attempts": attempts, "error_message": error_message},
+            )
+        else:
+            result = db.execute(
+                text(
+                    """
+                    UPDATE notifications
+                    SET error_message = :error_message,
+                        next_attempt_at = NOW() + make_interval(secs => :delay_seconds)
+                    WHERE id = :id AND status = 'pending' AND attempts = :claimed_attempts
+                    """
+                ),
+                {
+                    "id": notification_id,
+                    "claimed_attempts": attempts,
+                    "error_message": error_message,
+                    "delay_seconds": _retry_delay_seconds(attempts),
+                },
+            )
+        if result.rowcount == 0:
+            logger.warning(
+                "Notification lease lost before result was recorded notification_id=%s attempts=%s sent=%s",
+                notification_id,
+                attempts,
+                error_message is None,
+            )
+    db.commit()
+    return len(rows)
+
+
+def run_dispatcher(stop_after_idle: bool = False) -> None:
+    from app.db.session import SessionLocal
+
+    with ThreadPoolExecutor(max_workers=settings.notification_outbox_concurrency) as executor:
+        while True:
+            db = SessionLocal()
+            try:
+                claimed = dispatch_pending_notifications(db, executor)
+            except Exception:
+                logger.exception("Notification outbox dispatch failed")
+                db.rollback()
+                claimed = 0
+            finally:
+                db.close()
+
+            if claimed:
+                continue
+            if stop_after_idle:
+                return
+            time.sleep(settings.notification_outbox_poll_seconds)
+
+
+if __name__ == "__main__":
+    configure_logging(
+        settings.log_level,
+        json_format=settings.log_format == "json",
+        info_sample_rate=settings.log_info_sample_rate,
+    )
+    run_dispatcher()
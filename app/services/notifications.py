@@ -3,11 +3,11 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 
-import requests
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.tracing import traced
 
 
 logger = logging.getLogger("app.notifications")
@@ -94,6 +94,10 @@ def get_or_create_notification_preferences(user_id: int, db: Session) -> dict:
         db.commit()
         return DEFAULT_NOTIFICATION_PREFERENCES.copy()
 
+    return _preferences_from_row(row)
+
+
+def _preferences_from_row(row) -> dict:
     return {
         "email": row["email_enabled"],
         "in_app": row["in_app_enabled"],
@@ -107,6 +111,71 @@ def get_or_create_notification_preferences(user_id: int, db: Session) -> dict:
     }
 
 
+def load_notification_preferences(user_ids: list[int], db: Session) -> dict[int, dict]:
+    """Preferences for many users in two statements, creating default rows without committing."""
+    if not user_ids:
+        return {}
+
+    db.execute(
+        text(
+            """
+            INSERT INTO notification_preferences (
+                user_id,
+                email_enabled,
+                in_app_enabled,
+                meeting_reminders_enabled,
+                group_activity_enabled,
+                weekly_digest_enabled,
+                digest_frequency,
+                quiet_hours_enabled
+            )
+            SELECT
+                user_id,
+                :email_enabled,
+                :in_app_enabled,
+                :meeting_reminders_enabled,
+                :group_activity_enabled,
+                :weekly_digest_enabled,
+                :digest_frequency,
+                :quiet_hours_enabled
+            FROM unnest(CAST(:user_ids AS integer[])) AS user_id
+            ON CONFLICT (user_id) DO NOTHING
+            """
+        ),
+        {
+            "user_ids": list(user_ids),
+            "email_enabled": DEFAULT_NOTIFICATION_PREFERENCES["email"],
+            "in_app_enabled": DEFAULT_NOTIFICATION_PREFERENCES["in_app"],
+            "meeting_reminders_enabled": DEFAULT_NOTIFICATION_PREFERENCES["meeting_reminders"],
+            "group_activity_enabled": DEFAULT_NOTIFICATION_PREFERENCES["group_activity"],
+            "weekly_digest_enabled": DEFAULT_NOTIFICATION_PREFERENCES["weekly_digest"],
+            "digest_frequency": DEFAULT_NOTIFICATION_PREFERENCES["digest_frequency"],
+            "quiet_hours_enabled": DEFAULT_NOTIFICATION_PREFERENCES["quiet_hours_enabled"],
+        },
+    )
+    rows = db.execute(
+        text(
+            """
+            SELECT
+                user_id,
+                email_enabled,
+                in_app_enabled,
+                meeting_reminders_enabled,
+                group_activity_enabled,
+                weekly_digest_enabled,
+                digest_frequency,
+                quiet_hours_enabled,
+                quiet_hours_start,
+                quiet_hours_end
+            FROM notification_preferences
+            WHERE user_id = ANY(:user_ids)
+            """
+        ),
+        {"user_ids": list(user_ids)},
+    ).mappings().all()
+    return {row["user_id"]: _preferences_from_row(row) for row in rows}
+
+
 def update_notification_preferences(user_id: int, payload: dict, db: Session) -> dict:
     get_or_create_notification_preferences(user_id, db)
     db.execute(
@@ -144,21 +213,48 @@ def update_notification_preferences(user_id: int, payload: dict, db: Session) ->
     return get_or_create_notification_preferences(user_id, db)
 
 
-def _insert_notification(
-    *,
-    user_id: int,
-    meeting_id: int | None,
-    channel: str,
-    notification_type: str,
-    title: str,
-    message: str,
-    status: str,
-    db: Session,
-    provider_message_id: str | None = None,
-    error_message: str | None = None,
-    sent_at: datetime | None = None,
-) -> int:
-    row = db.execute(
+def _in_app_notification(*, user_id: int, meeting_id: int | None, notification_type: str, title: str, message: str) -> dict:
+    return {
+        "user_id": user_id,
+        "meeting_id": meeting_id,
+        "channel": "in_app",
+        "type": notification_type,
+        "title": title,
+        "message": message,
+        "status": "sent",
+        "error_message": None,
+        "sent_at": datetime.now(timezone.utc),
+    }
+
+
+def _email_notification(*, user_id: int, meeting_id: int | None, notification_type: str, title: str, message: str) -> dict:
+    """Outbox row for one email: 'pending' for app.services.notification_outbox, or 'skipped' without Resend."""
+    row = {
+        "user_id": user_id,
+        "meeting_id": meeting_id,
+        "channel": "email",
+        "type": notification_type,
+        "title": title,
+        "message": message,
+        "status": "pending",
+        "error_message": None,
+        "sent_at": None,
+    }
+    if not settings.resend_api_key or not settings.email_from_address:
+        row.update(status="skipped", error_message="Resend not configured", sent_at=datetime.now(timezone.utc))
+    return row
+
+
+def _insert_notifications(rows: list[dict], db: Session) -> None:
+    """Write all rows with one INSERT; ids follow list order."""
+    if not rows:
+        return
+
+    skipped = sum(1 for row in rows if row["status"] == "skipped")
+    if skipped:
+        logger.info("Skipping %s email send(s); Resend not configured type=%s", skipped, rows[0]["type"])
+
+    db.execute(
         text(
             """
             INSERT INTO notifications (
@@ -169,144 +265,66 @@ def _insert_notification(
                 title,
                 message,
                 status,
-                provider_message_id,
                 error_message,
                 sent_at
             )
-            VALUES (
-                :user_id,
-                :meeting_id,
-                :channel,
-                :type,
-                :title,
-                :message,
-                :status,
-                :provider_message_id,
-                :error_message,
-                :sent_at
-            )
-            RETURNING id
+            SELECT user_id, meeting_id, channel, type, title, message, status, error_message, sent_at
+            FROM unnest(
+                CAST(:user_ids AS integer[]),
+                CAST(:meeting_ids AS integer[]),
+                CAST(:channels AS text[]),
+                CAST(:types AS text[]),
+                CAST(:titles AS text[]),
+                CAST(:messages AS text[]),
+                CAST(:statuses AS text[]),
+                CAST(:error_messages AS text[]),
+                CAST(:sent_ats AS timestamptz[])
+            ) WITH ORDINALITY AS n(user_id, meeting_id, channel, type, title, message, status, error_message, sent_at, position)
+            ORDER BY position
             """
         ),
         {
-            "user_id": user_id,
-            "meeting_id": meeting_id,
-            "channel": channel,
-            "type": notification_type,
-            "title": title,
-            "message": message,
-            "status": status,
-            "provider_message_id": provider_message_id,
-            "error_message": error_message,
-            "sent_at": sent_at,
+            "user_ids": [row["user_id"] for row in rows],
+            "meeting_ids": [row["meeting_id"] for row in rows],
+            "channels": [row["channel"] for row in rows],
+            "types": [row["type"] for row in rows],
+            "titles": [row["title"] for row in rows],
+            "messages": [row["message"] for row in rows],
+            "statuses": [row["status"] for row in rows],
+            "error_messages": [row["error_message"] for row in rows],
+            "sent_ats": [row["sent_at"] for row in rows],
         },
-    ).fetchone()
-    return row[0]
-
-
-def create_in_app_notification(
-    *,
-    user_id: int,
-    meeting_id: int | None,
-    notification_type: str,
-    title: str,
-    message: str,
-    db: Session,
-) -> None:
-    _insert_notification(
-        user_id=user_id,
-        meeting_id=meeting_id,
-        channel="in_app",
-        notification_type=notification_type,
-        title=title,
-        message=message,
-        status="sent",
-        db=db,
-        sent_at=datetime.now(timezone.utc),
     )
 
 
-def send_email_notification(
+@traced()
+def _fan_out(
+    recipients: list[dict],
     *,
-    user_id: int,
-    recipient_email: str,
-    meeting_id: int | None,
+    meeting_id: int,
     notification_type: str,
-    subject: str,
+    title: str,
     message: str,
     db: Session,
+    email_preference: str | None = None,
 ) -> None:
-    sent_at = datetime.now(timezone.utc)
-
-    if not settings.resend_api_key or not settings.email_from_address:
-        logger.info(
-            "Skipping email send; Resend not configured user_id=%s recipient=%s subject=%s message=%s",
-            user_id,
-            recipient_email,
-            subject,
-            message,
-        )
-        _insert_notification(
-            user_id=user_id,
-            meeting_id=meeting_id,
-            channel="email",
-            notification_type=notification_type,
-            title=subject,
-            message=message,
-            status="skipped",
-            db=db,
-            error_message="Resend not configured",
-            sent_at=sent_at,
-        )
-        return
-
-    from_header = settings.email_from_address
-    if settings.email_from_name:
-        from_header = f"{settings.email_from_name} <{settings.email_from_address}>"
-
-    try:
-        response = requests.post(
-            "https://api.resend.com/emails",
-            headers={
-                "Authorization": f"Bearer {settings.resend_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "from": from_header,
-                "to": [recipient_email],
-                "subject": subject,
-                "text": message,
-            },
-            timeout=15,
-        )
-        response.raise_for_status()
-        provider_message_id = response.json().get("id")
-        _insert_notification(
-            user_id=user_id,
-            meeting_id=meeting_id,
-            channel="email",
-            notification_type=notification_type,
-            title=subject,
-            message=message,
-            status="sent",
-            db=db,
-            provider_message_id=provider_message_id,
-            sent_at=sent_at,
-        )
-    except Exception as exc:  # noqa: BLE001
-        logger.exception("Failed to send Resend email user_id=%s recipient=%s", user_id, recipient_email)
-        _insert_notification(
-            user_id=user_id,
-            meeting_id=meeting_id,
-            channel="email",
-            notification_type=notification_type,
-            title=subject,
-            message=message,
-            status="failed",
-            db=db,
-            error_message=str(exc),
-            sent_at=sent_at,
-        )
+    """Queue in-app and email notifications for every recipient in a fixed number of statements."""
+    preferences = load_notification_preferences([recipient["id"] for recipient in recipients], db)
+    rows = []
+    for recipient in recipients:
+        recipient_preferences = preferences.get(recipient["id"], DEFAULT_NOTIFICATION_PREFERENCES)
+        fields = {
+            "user_id": recipient["id"],
+            "meeting_id": meeting_id,
+            "notification_type": notification_type,
+            "title": title,
+            "message": message,
+        }
+        if recipient_preferences["in_app"]:
+            rows.append(_in_app_notification(**fields))
+        if recipient_preferences["email"] and (email_preference is None or recipient_preferences[email_preference]):
+            rows.append(_email_notification(**fields))
+    _insert_notifications(rows, db)
 
 
 def _load_meeting_context(meeting_id: int, db: Session) -> dict | None:
@@ -370,7 +388,9 @@ def _build_invite_message(context: dict, organizer_name: str) -> str:
     )
 
 
+@traced()
 def notify_meeting_invite(meeting_id: int, db: Session) -> None:
+    # Runs inside the caller's transaction so the outbox rows commit with the meeting change.
     context = _load_meeting_context(meeting_id, db)
     if context is None:
         return
@@ -378,34 +398,17 @@ def notify_meeting_invite(meeting_id: int, db: Session) -> None:
     recipients = [recipient for recipient in _load_notification_recipients(meeting_id, db) if recipient["status"] == "invited"]
     organizer_name = " ".join(filter(None, [context.get("organizer_first_name"), context.get("organizer_last_name")])).strip() or "Your organizer"
 
-    for recipient in recipients:
-        preferences = get_or_create_notification_preferences(recipient["id"], db)
-        subject = f"Meeting invite: {context['title']}"
-        message = _build_invite_message(context, organizer_name)
-
-        if preferences["in_app"]:
-            create_in_app_notification(
-                user_id=recipient["id"],
-                meeting_id=meeting_id,
-                notification_type="invite",
-                title=subject,
-                message=message,
-                db=db,
-            )
-        if preferences["email"]:
-            send_email_notification(
-                user_id=recipient["id"],
-                recipient_email=recipient["email"],
-                meeting_id=meeting_id,
-                notification_type="invite",
-                subject=subject,
-                message=message,
-                db=db,
-            )
-
-    db.commit()
+    _fan_out(
+        recipients,
+        meeting_id=meeting_id,
+        notification_type="invite",
+        title=f"Meeting invite: {context['title']}",
+        message=_build_invite_message(context, organizer_name),
+        db=db,
+    )
 
 
+@traced()
 def notify_meeting_cancelled(meeting_id: int, db: Session) -> None:
     context = _load_meeting_context(meeting_id, db)
     if context is None:
@@ -419,31 +422,10 @@ def notify_meeting_cancelled(meeting_id: int, db: Session) -> None:
         f"Check the app for details: {settings.app_base_url}/meetings"
     )
 
-    for recipient in recipients:
-        preferences = get_or_create_notification_preferences(recipient["id"], db)
-        if preferences["in_app"]:
-            create_in_app_notification(
-                user_id=recipient["id"],
-                meeting_id=meeting_id,
-                notification_type="cancel",
-                title=subject,
-                message=message,
-                db=db,
-            )
-        if preferences["email"]:
-            send_email_notification(
-                user_id=recipient["id"],
-                recipient_email=recipient["email"],
-                meeting_id=meeting_id,
-                notification_type="cancel",
-                subject=subject,
-                message=message,
-                db=db,
-            )
-
-    db.commit()
+    _fan_out(recipients, meeting_id=meeting_id, notification_type="cancel", title=subject, message=message, db=db)
 
 
+@traced()
 def notify_meeting_updated(meeting_id: int, db: Session) -> None:
     context = _load_meeting_context(meeting_id, db)
     if context is None:
@@ -458,26 +440,12 @@ def notify_meeting_updated(meeting_id: int, db: Session) -> None:
         f"Review the update in the app: {settings.app_base_url}/meetings"
     )
 
-    for recipient in recipients:
-        preferences = get_or_create_notification_preferences(recipient["id"], db)
-        if preferences["in_app"]:
-            create_in_app_notification(
-                user_id=recipient["id"],
-                meeting_id=meeting_id,
-                notification_type="update",
-                title=subject,
-                message=message,
-                db=db,
-            )
-        if preferences["email"] and preferences["meeting_reminders"]:
-            send_email_notification(
-                user_id=recipient["id"],
-                recipient_email=recipient["email"],
-                meeting_id=meeting_id,
-                notification_type="update",
-                subject=subject,
-                message=message,
-                db=db,
-            )
-
-    db.commit()
+    _fan_out(
+        recipients,
+        meeting_id=meeting_id,
+        notification_type="update",
+        title=subject,
+        message=message,
+        db=db,
+        email_preference="meeting_reminders",
+    )
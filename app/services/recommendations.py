@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterable
 from datetime import date, datetime, time, timedelta
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.tracing import current_span, traced
+
+
+MINUTES_PER_DAY = 24 * 60
+RECOMMENDATION_ENGINES = ("intervals", "bitmap")
+
+# Pre-merged weekly intervals per user. The TTL bounds staleness across worker processes,
+# which never see each other's invalidations.
+weekly_availability_cache = LRUCache(
+    maxsize=settings.weekly_availability_cache_size,
+    ttl_seconds=settings.weekly_availability_cache_ttl_seconds,
+)
+
+
+def invalidate_weekly_availability(user_id: int) -> None:
+    weekly_availability_cache.invalidate(user_id)
+
 
 def _time_to_minutes(value: time) -> int:
     return value.hour * 60 + value.minute
@@ -100,8 +122,22 @@ def _daterange(start_date: date, end_date: date):
         current += timedelta(days=1)
 
 
-def _load_weekly_availability(user_ids: list[int], db: Session) -> dict[int, dict[int, list[tuple[int, int]]]]:
-    availability_by_user = {user_id: {} for user_id in user_ids}
+@traced()
+def load_weekly_availability(user_ids: list[int], db: Session) -> dict[int, dict[int, list[tuple[int, int]]]]:
+    availability_by_user: dict[int, dict[int, list[tuple[int, int]]]] = {}
+    missing_user_ids: list[int] = []
+    for user_id in user_ids:
+        cached = weekly_availability_cache.get(user_id)
+        if cached is None:
+            missing_user_ids.append(user_id)
+        else:
+            availability_by_user[user_id] = cached
+
+    if not missing_user_ids:
+        return availability_by_user
+
+    generation = weekly_availability_cache.generation
+    loaded_by_user: dict[int, dict[int, list[tuple[int, int]]]] = {user_id: {} for user_id in missing_user_ids}
     rows = db.execute(
         text(
             """
@@ -111,20 +147,23 @@ def _load_weekly_availability(user_ids: list[int], db: Session) -> dict[int, dic
             ORDER BY user_id, day_of_week, start_time
             """
         ),
-        {"user_ids": user_ids},
+        {"user_ids": missing_user_ids},
     ).mappings().all()
 
     for row in rows:
-        user_day_intervals = availability_by_user[row["user_id"]].setdefault(row["day_of_week"], [])
+        user_day_intervals = loaded_by_user[row["user_id"]].setdefault(row["day_of_week"], [])
         user_day_intervals.append((_time_to_minutes(row["start_time"]), _time_to_minutes(row["end_time"])))
 
-    for user_id in availability_by_user:
-        for day_of_week, intervals in availability_by_user[user_id].items():
-            availability_by_user[user_id][day_of_week] = _merge_intervals(intervals)
+    for user_id, weekly_availability in loaded_by_user.items():
+        for day_of_week, intervals in weekly_availability.items():
+            weekly_availability[day_of_week] = _merge_intervals(intervals)
+        weekly_availability_cache.set(user_id, weekly_availability, generation=generation)
+        availability_by_user[user_id] = weekly_availability
 
     return availability_by_user
 
 
+@traced()
 def _load_busy_meetings(
     user_ids: list[int], start_date: date, end_date: date, db: Session,
     exclude_meeting_id: int | None = None,
@@ -133,45 +172,92 @@ def _load_busy_meetings(
     window_start = datetime.combine(start_date, time.min)
     window_end = datetime.combine(end_date + timedelta(days=1), time.min)
 
-    for user_id in user_ids:
-        rows = db.execute(
-            text(
-                """
-                SELECT DISTINCT m.id, m.start_time, m.end_time
-                FROM meetings m
-                LEFT JOIN meeting_attendees ma
-                    ON ma.meeting_id = m.id AND ma.user_id = :user_id
-                WHERE COALESCE(m.status, 'confirmed') <> 'cancelled'
-                  AND m.end_time > :window_start
-                  AND m.start_time < :window_end
-                  AND (:exclude_meeting_id IS NULL OR m.id <> :exclude_meeting_id)
-                  AND (
-                    m.created_by = :user_id
-                    OR ma.status IN ('invited', 'accepted', 'maybe')
-                  )
-                ORDER BY m.start_time ASC
-                """
-            ),
+    rows = db.execute(
+        text(
+            """
+            SELECT ma.user_id, m.id, m.start_time, m.end_time
+            FROM meetings m
+            JOIN meeting_attendees ma ON ma.meeting_id = m.id
+            WHERE ma.user_id = ANY(:user_ids)
+              AND ma.status IN ('invited', 'accepted', 'maybe')
+              AND m.status <> 'cancelled'
+              AND m.time_range && tstzrange(CAST(:window_start AS timestamptz), CAST(:window_end AS timestamptz), '[)')
+              AND (:exclude_meeting_id IS NULL OR m.id <> :exclude_meeting_id)
+            UNION
+            SELECT m.created_by AS user_id, m.id, m.start_time, m.end_time
+            FROM meetings m
+            WHERE m.created_by = ANY(:user_ids)
+              AND m.status <> 'cancelled'
+              AND m.time_range && tstzrange(CAST(:window_start AS timestamptz), CAST(:window_end AS timestamptz), '[)')
+              AND (:exclude_meeting_id IS NULL OR m.id <> :exclude_meeting_id)
+            ORDER BY user_id, start_time ASC
+            """
+        ),
+        {
+            "user_ids": user_ids,
+            "window_start": window_start,
+            "window_end": window_end,
+            "exclude_meeting_id": exclude_meeting_id,
+        },
+    ).mappings().all()
+
+    for row in rows:
+        busy_by_user[row["user_id"]].append(
+            {"id": row["id"], "start_time": row["start_time"], "end_time": row["end_time"]}
+        )
+
+    return busy_by_user
+
+
+@traced()
+def _load_materialized_busy_intervals(
+    user_ids: list[int], start_date: date, end_date: date, db: Session,
+    exclude_meeting_id: int | None = None,
+) -> dict[int, list[dict]]:
+    # Rows are already sliced per day, so they are returned as naive same-day meeting
+    # pieces and flow through _busy_intervals_for_day / _busy_mask unchanged.
+    busy_by_user: dict[int, list[dict]] = {user_id: [] for user_id in user_ids}
+    rows = db.execute(
+        text(
+            """
+            SELECT user_id, day, meeting_id, start_minute, end_minute
+            FROM user_busy_intervals
+            WHERE user_id = ANY(:user_ids)
+              AND day BETWEEN :start_date AND :end_date
+              AND (:exclude_meeting_id IS NULL OR meeting_id <> :exclude_meeting_id)
+            ORDER BY user_id, day, start_minute
+            """
+        ),
+        {
+            "user_ids": user_ids,
+            "start_date": start_date,
+            "end_date": end_date,
+            "exclude_meeting_id": exclude_meeting_id,
+        },
+    ).mappings().all()
+
+    for row in rows:
+        day_start = datetime.combine(row["day"], time.min)
+        busy_by_user[row["user_id"]].append(
             {
-                "user_id": user_id,
-                "window_start": window_start,
-                "window_end": window_end,
-                "exclude_meeting_id": exclude_meeting_id,
-            },
-        ).mappings().all()
-        busy_by_user[user_id] = [dict(row) for row in rows]
+                "id": row["meeting_id"],
+                "start_time": day_start + timedelta(minutes=row["start_minute"]),
+                "end_time": day_start + timedelta(minutes=row["end_minute"]),
+            }
+        )
 
     return busy_by_user
 
 
-def _busy_intervals_for_day(meetings: list[dict], current_date: date) -> list[tuple[int, int]]:
-    reference_tzinfo = None
+def _reference_tzinfo(meetings: list[dict]):
     for meeting in meetings:
         if meeting["start_time"].tzinfo is not None:
-            reference_tzinfo = meeting["start_time"].tzinfo
-            break
+            return meeting["start_time"].tzinfo
+    return None
 
-    day_start = datetime.combine(current_date, time.min, tzinfo=reference_tzinfo)
+
+def _busy_intervals_for_day(meetings: list[dict], current_date: date) -> list[tuple[int, int]]:
+    day_start = datetime.combine(current_date, time.min, tzinfo=_reference_tzinfo(meetings))
     day_end = day_start + timedelta(days=1)
     intervals: list[tuple[int, int]] = []
 
@@ -216,23 +302,214 @@ def _build_day_candidates(
     for interval_start, interval_end in shared_intervals or []:
         candidate_start = _round_up_to_increment(interval_start, increment_minutes)
         while candidate_start + duration_minutes <= interval_end:
-            start_time = datetime.combine(current_date, _minutes_to_time(candidate_start))
-            end_time = datetime.combine(current_date, _minutes_to_time(candidate_start + duration_minutes))
             candidates.append(
-                {
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "available_attendee_count": len(participant_ids),
-                    "conflicted_attendee_count": 0,
-                    "score": 100,
-                    "reason": "All selected attendees are available and no existing meetings overlap.",
-                }
+                _full_match_candidate(current_date, candidate_start, duration_minutes, len(participant_ids))
             )
             candidate_start += increment_minutes
 
     return candidates
 
 
+def _full_match_candidate(
+    current_date: date, candidate_start: int, duration_minutes: int, participant_count: int
+) -> dict:
+    return {
+        "start_time": datetime.combine(current_date, _minutes_to_time(candidate_start)),
+        "end_time": datetime.combine(current_date, _minutes_to_time(candidate_start + duration_minutes)),
+        "available_attendee_count": participant_count,
+        "conflicted_attendee_count": 0,
+        "score": 100,
+        "reason": "All selected attendees are available and no existing meetings overlap.",
+    }
+
+
+def weekly_availability_mask(weekly_availability: dict[int, list[tuple[int, int]]]) -> np.ndarray:
+    mask = np.zeros((7, MINUTES_PER_DAY), dtype=bool)
+    for day_of_week, intervals in weekly_availability.items():
+        for start, end in intervals:
+            mask[day_of_week, start:end] = True
+    return mask
+
+
+def _busy_mask(meetings: list[dict], start_date: date, day_count: int) -> np.ndarray:
+    # Same minute flooring as _busy_intervals_for_day, applied once across the whole window.
+    window_start = datetime.combine(start_date, time.min, tzinfo=_reference_tzinfo(meetings))
+    window_end = window_start + timedelta(days=day_count)
+    mask = np.zeros(day_count * MINUTES_PER_DAY, dtype=bool)
+
+    for meeting in meetings:
+        overlap_start = max(meeting["start_time"], window_start)
+        overlap_end = min(meeting["end_time"], window_end)
+        if overlap_end <= overlap_start:
+            continue
+        start_minutes = int((overlap_start - window_start).total_seconds() // 60)
+        end_minutes = int((overlap_end - window_start).total_seconds() // 60)
+        mask[start_minutes:end_minutes] = True
+
+    return mask.reshape(day_count, MINUTES_PER_DAY)
+
+
+def _build_bitmap_candidates(
+    start_date: date,
+    end_date: date,
+    participant_ids: list[int],
+    availability_by_user: dict[int, dict[int, list[tuple[int, int]]]],
+    busy_by_user: dict[int, list[dict]],
+    duration_minutes: int,
+    increment_minutes: int,
+) -> list[dict]:
+    """Minute-resolution equivalent of running _build_day_candidates for every day in the window.
+
+    Each participant contributes a (days x minutes) free mask; the shared mask is their AND,
+    and a start is valid when the prefix-sum window of length duration_minutes is all free.
+    """
+    dates = list(_daterange(start_date, end_date))
+    if not dates or duration_minutes > MINUTES_PER_DAY:
+        return []
+
+    shared = np.ones((len(dates), MINUTES_PER_DAY), dtype=bool)
+    for free in _bitmap_free_masks(dates, participant_ids, availability_by_user, busy_by_user):
+        shared &= free
+
+    day_positions, slot_positions = np.nonzero(_window_free_starts(shared, duration_minutes, increment_minutes))
+    return [
+        _full_match_candidate(
+            dates[day_position], int(slot_position) * increment_minutes, duration_minutes, len(participant_ids)
+        )
+        for day_position, slot_position in zip(day_positions, slot_positions)
+    ]
+
+
+def _bitmap_free_masks(
+    dates: list[date],
+    participant_ids: list[int],
+    availability_by_user: dict[int, dict[int, list[tuple[int, int]]]],
+    busy_by_user: dict[int, list[dict]],
+):
+    day_indices = np.array([_date_to_day_index(current_date) for current_date in dates])
+    for user_id in participant_ids:
+        available = weekly_availability_mask(availability_by_user.get(user_id, {}))[day_indices]
+        yield available & ~_busy_mask(busy_by_user.get(user_id, []), dates[0], len(dates))
+
+
+def _window_free_starts(free: np.ndarray, duration_minutes: int, increment_minutes: int) -> np.ndarray:
+    free_prefix = np.zeros((free.shape[0], MINUTES_PER_DAY + 1), dtype=np.int32)
+    np.cumsum(free, axis=1, out=free_prefix[:, 1:])
+    window_free = (free_prefix[:, duration_minutes:] - free_prefix[:, :-duration_minutes]) == duration_minutes
+    return window_free[:, ::increment_minutes]
+
+
+def _day_free_start_counts(
+    current_date: date,
+    participant_ids: list[int],
+    availability_by_user: dict[int, dict[int, list[tuple[int, int]]]],
+    busy_by_user: dict[int, list[dict]],
+    duration_minutes: int,
+    increment_minutes: int,
+) -> dict[int, int]:
+    day_index = _date_to_day_index(current_date)
+    counts: dict[int, int] = {}
+
+    for user_id in participant_ids:
+        daily_availability = availability_by_user.get(user_id, {}).get(day_index, [])
+        if not daily_availability:
+            continue
+
+        busy_intervals = _busy_intervals_for_day(busy_by_user.get(user_id, []), current_date)
+        for interval_start, interval_end in _subtract_intervals(daily_availability, busy_intervals):
+            candidate_start = _round_up_to_increment(interval_start, increment_minutes)
+            while candidate_start + duration_minutes <= interval_end:
+                counts[candidate_start] = counts.get(candidate_start, 0) + 1
+                candidate_start += increment_minutes
+
+    return counts
+
+
+def _scored_starts(
+    start_date: date,
+    end_date: date,
+    participant_ids: list[int],
+    availability_by_user: dict[int, dict[int, list[tuple[int, int]]]],
+    busy_by_user: dict[int, list[dict]],
+    duration_minutes: int,
+    increment_minutes: int,
+    engine: str,
+) -> Iterable[tuple[date, int, int]]:
+    """Yield (date, start minute, free attendee count) in chronological order, skipping starts nobody can make."""
+    if engine == "bitmap":
+        dates = list(_daterange(start_date, end_date))
+        if not dates or duration_minutes > MINUTES_PER_DAY:
+            return
+
+        counts = None
+        for free in _bitmap_free_masks(dates, participant_ids, availability_by_user, busy_by_user):
+            window_free = _window_free_starts(free, duration_minutes, increment_minutes)
+            counts = window_free.astype(np.int32) if counts is None else counts + window_free
+        if counts is None:
+            return
+
+        for day_position, slot_position in zip(*np.nonzero(counts)):
+            yield dates[day_position], int(slot_position) * increment_minutes, int(counts[day_position, slot_position])
+        return
+
+    for current_date in _daterange(start_date, end_date):
+        counts = _day_free_start_counts(
+            current_date=current_date,
+            participant_ids=participant_ids,
+            availability_by_user=availability_by_user,
+            busy_by_user=busy_by_user,
+            duration_minutes=duration_minutes,
+            increment_minutes=increment_minutes,
+        )
+        for candidate_start in sorted(counts):
+            yield current_date, candidate_start, counts[candidate_start]
+
+
+def _top_scored_candidates(
+    scored_starts: Iterable[tuple[date, int, int]],
+    participant_count: int,
+    duration_minutes: int,
+    max_results: int,
+) -> list[dict]:
+    # Bounded min-heap keyed on (free count, -arrival order): the root is always the weakest
+    # slot kept so far, so memory stays at max_results no matter how many windows are scanned.
+    heap: list[tuple[int, int, date, int]] = []
+    for order, (current_date, candidate_start, available_count) in enumerate(scored_starts):
+        entry = (available_count, -order, current_date, candidate_start)
+        if len(heap) < max_results:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    return [
+        _partial_match_candidate(current_date, candidate_start, duration_minutes, available_count, participant_count)
+        for available_count, _, current_date, candidate_start in sorted(heap, reverse=True)
+    ]
+
+
+def _partial_match_candidate(
+    current_date: date,
+    candidate_start: int,
+    duration_minutes: int,
+    available_count: int,
+    participant_count: int,
+) -> dict:
+    candidate = _full_match_candidate(current_date, candidate_start, duration_minutes, participant_count)
+    if available_count == participant_count:
+        return candidate
+
+    candidate.update(
+        {
+            "available_attendee_count": available_count,
+            "conflicted_attendee_count": participant_count - available_count,
+            "score": round(100 * available_count / participant_count),
+            "reason": f"{available_count} of {participant_count} selected attendees are available.",
+        }
+    )
+    return candidate
+
+
+@traced()
 def recommend_common_slots(
     user_ids: list[int],
     start_date: date,
@@ -242,28 +519,73 @@ def recommend_common_slots(
     db: Session,
     increment_minutes: int = 30,
     exclude_meeting_id: int | None = None,
+    engine: str | None = None,
+    allow_partial: bool = False,
 ) -> list[dict]:
-    availability_by_user = _load_weekly_availability(user_ids, db)
-    busy_by_user = _load_busy_meetings(
+    engine = engine or settings.recommendation_engine
+    if engine not in RECOMMENDATION_ENGINES:
+        raise ValueError(f"Unknown recommendation engine: {engine}")
+    active_span = current_span()
+    if active_span is not None:
+        active_span.attributes.update(
+            {"participants": len(user_ids), "days": (end_date - start_date).days + 1, "engine": engine}
+        )
+
+    availability_by_user = load_weekly_availability(user_ids, db)
+    load_busy = (
+        _load_materialized_busy_intervals
+        if settings.busy_intervals_source == "materialized"
+        else _load_busy_meetings
+    )
+    busy_by_user = load_busy(
         user_ids, start_date, end_date, db,
         exclude_meeting_id=exclude_meeting_id,
     )
 
-    all_candidates: list[dict] = []
-    for current_date in _daterange(start_date, end_date):
-        all_candidates.extend(
-            _build_day_candidates(
-                current_date=current_date,
+    if allow_partial:
+        ranked_candidates = _top_scored_candidates(
+            _scored_starts(
+                start_date=start_date,
+                end_date=end_date,
                 participant_ids=user_ids,
                 availability_by_user=availability_by_user,
                 busy_by_user=busy_by_user,
                 duration_minutes=duration_minutes,
                 increment_minutes=increment_minutes,
-            )
+                engine=engine,
+            ),
+            participant_count=len(user_ids),
+            duration_minutes=duration_minutes,
+            max_results=max_results,
         )
+    else:
+        if engine == "bitmap":
+            all_candidates = _build_bitmap_candidates(
+                start_date=start_date,
+                end_date=end_date,
+                participant_ids=user_ids,
+                availability_by_user=availability_by_user,
+                busy_by_user=busy_by_user,
+                duration_minutes=duration_minutes,
+                increment_minutes=increment_minutes,
+            )
+        else:
+            all_candidates = []
+            for current_date in _daterange(start_date, end_date):
+                all_candidates.extend(
+                    _build_day_candidates(
+                        current_date=current_date,
+                        participant_ids=user_ids,
+                        availability_by_user=availability_by_user,
+                        busy_by_user=busy_by_user,
+                        duration_minutes=duration_minutes,
+                        increment_minutes=increment_minutes,
+                    )
+                )
+
+        all_candidates.sort(key=lambda candidate: candidate["start_time"])
+        ranked_candidates = all_candidates[:max_results]
 
-    all_candidates.sort(key=lambda candidate: candidate["start_time"])
-    ranked_candidates = all_candidates[:max_results]
     for index, candidate in enumerate(ranked_candidates, start=1):
         candidate["rank"] = index
 
@@ -19,8 +19,8 @@ export async function getUserAvailability(userId, start, end) {
     JOIN meeting_attendees ma ON ma.meeting_id = m.id
     WHERE ma.user_id = $1
     AND ma.status = 'accepted'
-    AND m.start_time < $3
-    AND m.end_time > $2
+    AND m.status <> 'cancelled'
+    AND m.time_range && tstzrange($2, $3, '[)')
     ORDER BY start
   `, [userId, startDate, endDate]);
 
@@ -0,0 +1,58 @@
+-- Optional: convert refresh_tokens into a table range-partitioned by expires_at, so whole months of
+-- expired tokens can be dropped instead of deleted row by row.
+-- Run once during a maintenance window, then schedule `python -m app.db.refresh_tokens`, which
+-- creates upcoming monthly partitions and drops expired ones.
+-- Partitioned unique constraints must include the partition key, so uniqueness becomes
+-- (token_hash, expires_at); lookups by token_hash still use that index.
+-- Kept out of db/ itself because docker-compose runs every top-level db/*.sql on a fresh volume.
+
+BEGIN;
+
+ALTER TABLE refresh_tokens RENAME TO refresh_tokens_unpartitioned;
+
+CREATE TABLE refresh_tokens (
+  id BIGINT NOT NULL DEFAULT nextval('refresh_tokens_id_seq'),
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  token_hash TEXT NOT NULL,
+  issued_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  expires_at TIMESTAMPTZ NOT NULL,
+  revoked_at TIMESTAMPTZ,
+  replaced_by_token_hash TEXT,
+  user_agent TEXT,
+  ip_address TEXT,
+  PRIMARY KEY (id, expires_at),
+  UNIQUE (token_hash, expires_at)
+) PARTITION BY RANGE (expires_at);
+
+ALTER SEQUENCE refresh_tokens_id_seq OWNED BY refresh_tokens.id;
+
+-- Monthly partitions for every live token (lifetimes are refresh_token_expire_days, default 30).
+DO $$
+DECLARE month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT generate_series(date_trunc('month', NOW()), date_trunc('month', NOW()) + INTERVAL '3 months', INTERVAL '1 month')::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE refresh_tokens_p%s PARTITION OF refresh_tokens FOR VALUES FROM (%L) TO (%L)',
+            to_char(month_start, 'YYYYMM'),
+            month_start,
+            (month_start + INTERVAL '1 month')::date
+        );
+    END LOOP;
+END $$;
+
+-- Catches anything outside the monthly partitions created above and by the maintenance job.
+CREATE TABLE refresh_tokens_default PARTITION OF refresh_tokens DEFAULT;
+
+INSERT INTO refresh_tokens
+SELECT * FROM refresh_tokens_unpartitioned
+WHERE revoked_at IS NULL AND expires_at > NOW();
+
+DROP TABLE refresh_tokens_unpartitioned;
+
+CREATE INDEX idx_refresh_tokens_user_id ON refresh_tokens(user_id);
+CREATE INDEX idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+CREATE INDEX idx_refresh_tokens_revoked_at ON refresh_tokens(revoked_at) WHERE revoked_at IS NOT NULL;
+
+COMMIT;
@@ -94,7 +94,9 @@ CREATE TABLE meetings (
   cleanup_minutes INTEGER DEFAULT 0,
   status TEXT NOT NULL DEFAULT 'confirmed' CHECK (status IN ('proposed', 'confirmed', 'cancelled')),
   created_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
-  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  -- Half-open [start_time, end_time) for GiST-indexed overlap (&&) queries
+  time_range TSTZRANGE GENERATED ALWAYS AS (tstzrange(start_time, end_time, '[)')) STORED
 );
 
 -- Here we relate the users with the meeting 
@@ -132,11 +134,24 @@ CREATE TABLE notifications (
   status TEXT NOT NULL CHECK (status IN ('pending', 'sent', 'failed', 'read', 'skipped')),
   provider_message_id TEXT,
   error_message TEXT,
+  -- Email outbox bookkeeping for app.services.notification_outbox
+  attempts INTEGER NOT NULL DEFAULT 0,
+  next_attempt_at TIMESTAMPTZ,
   created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
   sent_at TIMESTAMPTZ,
   read_at TIMESTAMPTZ
 );
 
+-- Materialized per-user, per-day busy minute ranges, maintained whenever a meeting or its attendees change
+CREATE TABLE user_busy_intervals (
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  day DATE NOT NULL,
+  meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+  start_minute SMALLINT NOT NULL,
+  end_minute SMALLINT NOT NULL,
+  PRIMARY KEY (user_id, day, meeting_id)
+);
+
 CREATE INDEX idx_time_slot_preferences_user_id ON time_slot_preferences(user_id);
 CREATE INDEX idx_group_memberships_group_id ON group_memberships(group_id);
 CREATE INDEX idx_user_calendars_user_id ON user_calendars(user_id);
@@ -145,5 +160,16 @@ CREATE INDEX idx_meeting_attendees_user_id ON meeting_attendees(user_id);
 CREATE INDEX idx_notification_preferences_user_id ON notification_preferences(user_id);
 CREATE INDEX idx_notifications_user_id ON notifications(user_id);
 CREATE INDEX idx_notifications_meeting_id ON notifications(meeting_id);
+CREATE INDEX idx_notifications_email_outbox ON notifications(next_attempt_at, id) WHERE status = 'pending' AND channel = 'email';
 CREATE INDEX idx_auth_identities_user_id ON auth_identities(user_id);
 CREATE INDEX idx_refresh_tokens_user_id ON refresh_tokens(user_id);
+-- Expiry sweeps (app/db/refresh_tokens.py)
+CREATE INDEX idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+CREATE INDEX idx_refresh_tokens_revoked_at ON refresh_tokens(revoked_at) WHERE revoked_at IS NOT NULL;
+CREATE INDEX idx_user_busy_intervals_meeting_id ON user_busy_intervals(meeting_id);
+-- Keyset pagination on (start_time, id) for meeting and calendar listings
+CREATE INDEX idx_meetings_start_time_id ON meetings(start_time, id);
+CREATE INDEX idx_meetings_created_by_start_time_id ON meetings(created_by, start_time, id);
+CREATE INDEX idx_meetings_calendar_id_start_time_id ON meetings(calendar_id, start_time, id);
+-- Busy-time overlap lookups on live meetings
+CREATE INDEX idx_meetings_time_range_active ON meetings USING GIST (time_range) WHERE status <> 'cancelled';
@@ -51,6 +51,14 @@ function toISOString(date: string, hour: number, minute: number) {
   return `${date}T${String(hour).padStart(2, "0")}:${String(minute).padStart(2, "0")}:00`;
 }
 
+// The month around `date`, padded by a week each side so the month grid's leading/trailing days
+// and any week view that starts or ends in this month are covered by one fetch.
+function visibleRange(date: Date) {
+  const from = new Date(date.getFullYear(), date.getMonth(), 1 - 7);
+  const to = new Date(date.getFullYear(), date.getMonth() + 1, 1 + 7);
+  return { from: from.toISOString(), to: to.toISOString() };
+}
+
 export default function PersonalCalendar() {
   const [view, setView] = useState<"month" | "week">("month");
   const [currentDate, setCurrentDate] = useState(new Date());
@@ -82,16 +90,17 @@ export default function PersonalCalendar() {
   const [editColor, setEditColor] = useState("#3498db");
   const [editLocation, setEditLocation] = useState("");
 
-  // Load events on mount
+  // Reload whenever navigation moves to another month
+  const visibleMonth = `${currentDate.getFullYear()}-${currentDate.getMonth()}`;
   useEffect(() => {
     loadEvents();
-  }, []);
+  }, [visibleMonth]);
 
   async function loadEvents() {
     setLoading(true);
     setError("");
     try {
-      const data = await fetchEvents();
+      const data = await fetchEvents(visibleRange(currentDate));
       setEvents(data.map(toLocalEvent));
     } catch (err) {
       if (err instanceof Error && /not authenticated|invalid token|401/i.test(err.message)) {
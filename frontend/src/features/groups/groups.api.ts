@@ -65,6 +65,15 @@ export interface GroupAvailability {
   slots: GroupAvailabilitySlot[];
 }
 
+export interface GroupAvailabilityHeatmap {
+  groupId: number;
+  groupName: string;
+  incrementMinutes: number;
+  memberIds: number[];
+  counts: number[][];
+  memberBits: string[][] | null;
+}
+
 export interface TransferOwnershipPayload {
   newOwnerId: number;
 }
@@ -105,6 +114,22 @@ export async function getGroupAvailability(groupId: number) {
   return res.json() as Promise<GroupAvailability>;
 }
 
+export async function getGroupAvailabilityHeatmap(groupId: number, incrementMinutes = 30, includeMembers = false) {
+  const params = new URLSearchParams({
+    increment_minutes: String(incrementMinutes),
+    include_members: String(includeMembers),
+  });
+  const res = await fetch(`${API_URL}/groups/${groupId}/availability/heatmap?${params}`, {
+    headers: authHeaders(),
+  });
+
+  if (!res.ok) {
+    throw new Error(await parseError(res, "Failed to fetch group availability heatmap"));
+  }
+
+  return res.json() as Promise<GroupAvailabilityHeatmap>;
+}
+
 export async function createGroup(payload: CreateGroupPayload) {
   const res = await fetch(`${API_URL}/groups/`, {
     method: "POST",
@@ -66,6 +66,18 @@ const RSVP_STYLES = {
   },
 } as const;
 
+const PAST_DAYS_SHOWN = 90;
+const UPCOMING_DAYS_SHOWN = 365;
+
+function meetingWindow() {
+  const day = 24 * 60 * 60 * 1000;
+  const now = Date.now();
+  return {
+    from: new Date(now - PAST_DAYS_SHOWN * day).toISOString(),
+    to: new Date(now + UPCOMING_DAYS_SHOWN * day).toISOString(),
+  };
+}
+
 export default function MeetingList() {
   const [meetings, setMeetings] = useState<Meeting[]>([]);
   const [loading, setLoading] = useState(true);
@@ -77,7 +89,7 @@ export default function MeetingList() {
     setLoading(true);
     setError("");
     try {
-      const data = await listMeetings();
+      const data = await listMeetings(false, meetingWindow());
       setMeetings(data);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load meetings.");
@@ -121,3 +121,22 @@ export async function apiJson<T>(
 
   return response.json() as Promise<T>;
 }
+
+export const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+export const LIST_PAGE_SIZE = 100;
+
+// Follows the X-Next-Cursor header of a keyset-paginated list endpoint until the last page.
+export async function apiJsonAllPages<T>(path: string, params: URLSearchParams): Promise<T[]> {
+  const query = new URLSearchParams(params);
+  const items: T[] = [];
+  for (;;) {
+    const response = await apiFetch(`${path}?${query.toString()}`);
+    if (!response.ok) {
+      throw new Error(await getErrorMessage(response));
+    }
+    items.push(...((await response.json()) as T[]));
+    const cursor = response.headers.get(NEXT_CURSOR_HEADER);
+    if (!cursor) return items;
+    query.set("cursor", cursor);
+  }
+}
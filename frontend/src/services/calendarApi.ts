@@ -1,4 +1,4 @@
-import { apiJson } from "../lib/api";
+import { apiJson, apiJsonAllPages, LIST_PAGE_SIZE } from "../lib/api";
 
 export interface CalendarApiEvent {
   id: number;
@@ -19,8 +19,11 @@ export interface CalendarAvailabilitySlot {
 
 // ── Events ────────────────────────────────────────────────────────────────────
 
-export async function fetchEvents() {
-  return apiJson<CalendarApiEvent[]>("/calendar/events");
+export async function fetchEvents(window: { from?: string; to?: string; limit?: number } = {}) {
+  const params = new URLSearchParams({ limit: String(window.limit ?? LIST_PAGE_SIZE) });
+  if (window.from) params.set("from", window.from);
+  if (window.to) params.set("to", window.to);
+  return apiJsonAllPages<CalendarApiEvent>("/calendar/events", params);
 }
 
 export async function createEvent(event: {
@@ -1,4 +1,4 @@
-import { apiJson } from "../lib/api";
+import { apiJson, apiJsonAllPages, LIST_PAGE_SIZE } from "../lib/api";
 
 export interface MeetingAttendee {
   user_id: number;
@@ -76,10 +76,23 @@ export interface MeetingRecommendationsPayload {
   duration_minutes: number;
   max_results?: number;
   include_organizer?: boolean;
+  allow_partial?: boolean;
 }
 
-export async function listMeetings(includeCancelled = false) {
-  return apiJson<Meeting[]>(`/meetings/?include_cancelled=${includeCancelled}`);
+export interface MeetingListWindow {
+  from?: string;
+  to?: string;
+  limit?: number;
+}
+
+export async function listMeetings(includeCancelled = false, window: MeetingListWindow = {}) {
+  const params = new URLSearchParams({
+    include_cancelled: String(includeCancelled),
+    limit: String(window.limit ?? LIST_PAGE_SIZE),
+  });
+  if (window.from) params.set("from", window.from);
+  if (window.to) params.set("to", window.to);
+  return apiJsonAllPages<Meeting>("/meetings/", params);
 }
 
 export async function createMeeting(payload: CreateMeetingPayload) {
@@ -4,6 +4,8 @@ from sqlalchemy import text
 
 from app.main import create_app
 from app.db.session import SessionLocal
+from app.api.deps import active_user_cache
+from app.services.recommendations import weekly_availability_cache
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -29,6 +31,9 @@ def client() -> TestClient:
 
 @pytest.fixture(autouse=True)
 def _db_cleanup():
+    # Identities restart on every truncate, so per-user caches must not outlive a test.
+    weekly_availability_cache.clear()
+    active_user_cache.clear()
     db = SessionLocal()
     try:
         db.execute(
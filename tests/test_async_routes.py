@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+
+# Async variants are chosen when the route modules are imported, so they run in a fresh interpreter.
+_ASYNC_ROUTES_SCRIPT = textwrap.dedent(
+    """
+    from fastapi.testclient import TestClient
+
+    import app.api.deps as deps
+    from app.main import create_app
+
+    with TestClient(create_app()) as client:
+        response = client.post(
+            "/auth/register",
+            json={"first_name": "Ada", "last_name": "Lovelace", "email": "ada-async@example.com", "password": "supersecret123"},
+        )
+        assert response.status_code == 200, response.text
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = client.post("/groups/", headers=headers, json={"name": "Async group"})
+        assert response.status_code == 200, response.text
+        group_id = response.json()["id"]
+
+        def _no_sync_session():
+            raise AssertionError("async route opened a sync session")
+
+        deps.SessionLocal = _no_sync_session
+        deps.active_user_cache.clear()
+        for path in ["/meetings/", "/notifications/", "/calendar/events", f"/groups/{group_id}/availability"]:
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200, (path, response.text)
+    """
+)
+
+
+def test_async_routes_authenticate_without_the_sync_engine():
+    result = subprocess.run(
+        [sys.executable, "-c", _ASYNC_ROUTES_SCRIPT],
+        cwd=Path(__file__).resolve().parents[1],
+        env={**os.environ, "ASYNC_DB_ENABLED": "true"},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
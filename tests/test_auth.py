@@ -1,3 +1,9 @@
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+
 def test_register_login_me_refresh_logout(client):
     r = client.post(
         "/auth/register",
@@ -42,3 +48,134 @@ def test_login_invalid_password(client):
 
     r = client.post("/auth/login", json={"email": "grace@example.com", "password": "wrong"})
     assert r.status_code == 401
+
+
+def _stored_password_hash(email: str) -> str:
+    db = SessionLocal()
+    try:
+        return db.execute(
+            text(
+                """
+                SELECT pc.password_hash
+                FROM password_credentials pc
+                JOIN users u ON u.id = pc.user_id
+                WHERE u.email = :email
+                """
+            ),
+            {"email": email},
+        ).scalar_one()
+    finally:
+        db.close()
+
+
+def test_login_rehashes_password_when_scheme_changes(client, monkeypatch):
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    r = client.post(
+        "/auth/register",
+        json={
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": "ada@example.com",
+            "password": "supersecret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    assert _stored_password_hash("ada@example.com").startswith("$2b$04$")
+
+    monkeypatch.setattr(settings, "password_hash_scheme", "argon2")
+    monkeypatch.setattr(settings, "argon2_memory_cost", 8192)
+    r = client.post("/auth/login", json={"email": "ada@example.com", "password": "supersecret123"})
+    assert r.status_code == 200, r.text
+    upgraded = _stored_password_hash("ada@example.com")
+    assert upgraded.startswith("$argon2id$")
+
+    r = client.post("/auth/login", json={"email": "ada@example.com", "password": "supersecret123"})
+    assert r.status_code == 200, r.text
+    assert _stored_password_hash("ada@example.com") == upgraded
+
+
+def test_me_reflects_profile_update_through_user_cache(client):
+    r = client.post(
+        "/auth/register",
+        json={
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": "ada@example.com",
+            "password": "supersecret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    assert client.get("/auth/me", headers=headers).json()["first_name"] == "Ada"
+    r = client.patch("/auth/me", headers=headers, json={"first_name": "Augusta"})
+    assert r.status_code == 200, r.text
+    assert client.get("/auth/me", headers=headers).json()["first_name"] == "Augusta"
+
+
+def test_trusted_token_claims_skip_user_lookup(client, monkeypatch):
+    monkeypatch.setattr(settings, "auth_trust_token_claims", True)
+    r = client.post(
+        "/auth/register",
+        json={
+            "first_name": "Grace",
+            "last_name": "Hopper",
+            "email": "grace@example.com",
+            "password": "supersecret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE users SET first_name = 'Changed' WHERE email = 'grace@example.com'"))
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.get("/auth/me", headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["first_name"] == "Grace"
+
+
+def test_refresh_rejects_expired_token_and_purge_keeps_live_tokens(client):
+    from app.db.refresh_tokens import purge_refresh_tokens
+
+    r = client.post(
+        "/auth/register",
+        json={
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": "ada@example.com",
+            "password": "supersecret123",
+        },
+    )
+    assert r.status_code == 200, r.text
+    r = client.post("/auth/refresh")
+    assert r.status_code == 200, r.text
+
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE refresh_tokens SET expires_at = NOW() - INTERVAL '1 minute' WHERE revoked_at IS NULL"))
+        db.commit()
+    finally:
+        db.close()
+
+    r = client.post("/auth/refresh")
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Refresh token expired"
+
+    r = client.post("/auth/login", json={"email": "ada@example.com", "password": "supersecret123"})
+    assert r.status_code == 200, r.text
+
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE refresh_tokens SET expires_at = NOW() - INTERVAL '2 days' WHERE revoked_at IS NOT NULL"))
+        db.commit()
+        assert purge_refresh_tokens(db, batch_size=1) == 2
+        remaining = db.execute(text("SELECT revoked_at IS NULL FROM refresh_tokens")).scalars().all()
+    finally:
+        db.close()
+
+    assert remaining == [True]
@@ -184,3 +184,157 @@ def test_meeting_recommendations_full_match_only(client):
         f"{recommendation_date}T09:00:00",
         f"{recommendation_date}T11:00:00",
     ]
+
+
+def test_meeting_recommendations_partial_availability(client):
+    organizer_token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    attendee_token = register_user(client, first_name="Grace", last_name="Hopper", email="grace@example.com")
+    recommendation_date = "2026-04-07"
+    day_index = day_index_for(recommendation_date)
+
+    for token, start, end in [(organizer_token, "09:00:00", "11:00:00"), (attendee_token, "10:00:00", "12:00:00")]:
+        availability = client.post(
+            "/availability/",
+            headers=auth_headers(token),
+            json=[{"day_of_week": day_index, "start_time": start, "end_time": end}],
+        )
+        assert availability.status_code == 200, availability.text
+
+    request_body = {
+        "attendee_emails": ["grace@example.com"],
+        "start_date": recommendation_date,
+        "end_date": recommendation_date,
+        "duration_minutes": 60,
+        "max_results": 3,
+        "include_organizer": True,
+    }
+
+    full_match_response = client.post("/meetings/recommendations", headers=auth_headers(organizer_token), json=request_body)
+    assert full_match_response.status_code == 200, full_match_response.text
+    assert [item["start_time"] for item in full_match_response.json()["recommendations"]] == [
+        f"{recommendation_date}T10:00:00",
+    ]
+
+    partial_response = client.post(
+        "/meetings/recommendations",
+        headers=auth_headers(organizer_token),
+        json={**request_body, "allow_partial": True},
+    )
+    assert partial_response.status_code == 200, partial_response.text
+    recommendations = partial_response.json()["recommendations"]
+    assert [(item["start_time"], item["available_attendee_count"], item["score"]) for item in recommendations] == [
+        (f"{recommendation_date}T10:00:00", 2, 100),
+        (f"{recommendation_date}T09:00:00", 1, 50),
+        (f"{recommendation_date}T09:30:00", 1, 50),
+    ]
+    assert [item["rank"] for item in recommendations] == [1, 2, 3]
+    assert recommendations[1]["conflicted_attendee_count"] == 1
+
+
+def test_recommendations_reflect_availability_updates(client):
+    token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    recommendation_date = "2026-04-07"
+    day_index = day_index_for(recommendation_date)
+    request_body = {
+        "start_date": recommendation_date,
+        "end_date": recommendation_date,
+        "duration_minutes": 60,
+        "max_results": 1,
+        "include_organizer": True,
+    }
+
+    for start, end, expected_start in [("09:00:00", "10:00:00", "09:00:00"), ("14:00:00", "15:00:00", "14:00:00")]:
+        availability = client.post(
+            "/availability/",
+            headers=auth_headers(token),
+            json=[{"day_of_week": day_index, "start_time": start, "end_time": end}],
+        )
+        assert availability.status_code == 200, availability.text
+
+        response = client.post("/meetings/recommendations", headers=auth_headers(token), json=request_body)
+        assert response.status_code == 200, response.text
+        assert [item["start_time"] for item in response.json()["recommendations"]] == [
+            f"{recommendation_date}T{expected_start}",
+        ]
+
+
+def test_list_meetings_attendees_match_meeting_detail(client):
+    organizer_token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    register_user(client, first_name="Grace", last_name="Hopper", email="grace@example.com")
+    register_user(client, first_name="Alan", last_name="Turing", email="alan@example.com")
+
+    for day, attendee_emails in [("2026-04-01", ["grace@example.com", "alan@example.com"]), ("2026-04-02", [])]:
+        response = client.post(
+            "/meetings/",
+            headers=auth_headers(organizer_token),
+            json={
+                "title": f"Sync {day}",
+                "start_time": f"{day}T15:00:00Z",
+                "end_time": f"{day}T16:00:00Z",
+                "attendee_emails": attendee_emails,
+            },
+        )
+        assert response.status_code == 200, response.text
+
+    list_response = client.get("/meetings/", headers=auth_headers(organizer_token))
+    assert list_response.status_code == 200, list_response.text
+    items = list_response.json()
+    assert [len(item["attendees"]) for item in items] == [3, 1]
+
+    for item in items:
+        detail_response = client.get(f"/meetings/{item['id']}", headers=auth_headers(organizer_token))
+        assert detail_response.status_code == 200, detail_response.text
+        assert detail_response.json() == item
+
+
+def test_list_meetings_time_window_and_cursor_pagination(client):
+    token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    for day in ["2026-04-01", "2026-04-02", "2026-04-03", "2026-05-01"]:
+        response = client.post(
+            "/meetings/",
+            headers=auth_headers(token),
+            json={"title": f"Standup {day}", "start_time": f"{day}T15:00:00Z", "end_time": f"{day}T15:30:00Z"},
+        )
+        assert response.status_code == 200, response.text
+
+    window = {"from": "2026-04-01T00:00:00Z", "to": "2026-04-30T00:00:00Z", "limit": 2}
+    first_page = client.get("/meetings/", headers=auth_headers(token), params=window)
+    assert first_page.status_code == 200, first_page.text
+    assert [item["title"] for item in first_page.json()] == ["Standup 2026-04-01", "Standup 2026-04-02"]
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get("/meetings/", headers=auth_headers(token), params={**window, "cursor": cursor})
+    assert second_page.status_code == 200, second_page.text
+    assert [item["title"] for item in second_page.json()] == ["Standup 2026-04-03"]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    events_page = client.get("/calendar/events", headers=auth_headers(token), params={**window, "cursor": cursor})
+    assert events_page.status_code == 200, events_page.text
+    assert [item["title"] for item in events_page.json()] == ["Standup 2026-04-03"]
+
+    invalid_cursor = client.get("/meetings/", headers=auth_headers(token), params={"cursor": "not-a-cursor"})
+    assert invalid_cursor.status_code == 400, invalid_cursor.text
+
+
+def test_list_meetings_window_uses_half_open_overlap(client):
+    token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    for title, start, end in [
+        ("Ends at window start", "2026-04-01T09:00:00Z", "2026-04-01T10:00:00Z"),
+        ("Straddles window start", "2026-04-01T09:30:00Z", "2026-04-01T10:30:00Z"),
+        ("Starts at window end", "2026-04-01T12:00:00Z", "2026-04-01T13:00:00Z"),
+    ]:
+        response = client.post(
+            "/meetings/",
+            headers=auth_headers(token),
+            json={"title": title, "start_time": start, "end_time": end},
+        )
+        assert response.status_code == 200, response.text
+
+    window = {"from": "2026-04-01T10:00:00Z", "to": "2026-04-01T12:00:00Z"}
+    response = client.get("/meetings/", headers=auth_headers(token), params=window)
+    assert response.status_code == 200, response.text
+    assert [item["title"] for item in response.json()] == ["Straddles window start"]
+
+    response = client.get("/meetings/", headers=auth_headers(token), params={"to": "2026-04-01T10:00:00Z"})
+    assert response.status_code == 200, response.text
+    assert [item["title"] for item in response.json()] == ["Ends at window start", "Straddles window start"]
@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.db.session import TimedQueuePool, _queue_pool_stats, pool_checkout_metrics
+
+
+def test_timed_pool_records_checkouts_in_use_and_timeouts():
+    before = pool_checkout_metrics.stats()
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    conn = engine.connect()
+    try:
+        assert _queue_pool_stats(engine.pool)["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    finally:
+        conn.close()
+        engine.dispose()
+
+    after = pool_checkout_metrics.stats()
+    assert after["checkouts"] - before["checkouts"] == 2
+    assert after["timeouts"] - before["timeouts"] == 1
+    assert after["wait_seconds_max"] >= 0.05
@@ -183,3 +183,115 @@ def test_owner_can_transfer_ownership_and_remove_member(client):
         headers={"Authorization": f"Bearer {member_access}"},
     )
     assert removed_old_owner.status_code == 200, removed_old_owner.text
+
+
+def test_group_availability_heatmap_counts_and_member_bits(client):
+    import base64
+
+    owner_access = _register(client, "owner5@example.com")
+    created = client.post(
+        "/groups/",
+        headers={"Authorization": f"Bearer {owner_access}"},
+        json={"name": "Heatmap"},
+    )
+    assert created.status_code == 200, created.text
+    group_id = created.json()["id"]
+
+    member_access = _register(client, "member5@example.com")
+    joined = client.post(
+        "/groups/join",
+        headers={"Authorization": f"Bearer {member_access}"},
+        json={"groupId": group_id},
+    )
+    assert joined.status_code == 200, joined.text
+
+    for access, slots in (
+        (owner_access, [{"day_of_week": 1, "start_time": "09:00:00", "end_time": "12:00:00"}]),
+        (member_access, [{"day_of_week": 1, "start_time": "10:30:00", "end_time": "13:00:00"}]),
+    ):
+        saved = client.post("/availability/", headers={"Authorization": f"Bearer {access}"}, json=slots)
+        assert saved.status_code == 200, saved.text
+
+    heatmap = client.get(
+        f"/groups/{group_id}/availability/heatmap",
+        headers={"Authorization": f"Bearer {member_access}"},
+        params={"increment_minutes": 60, "include_members": True},
+    )
+    assert heatmap.status_code == 200, heatmap.text
+    payload = heatmap.json()
+    assert payload["incrementMinutes"] == 60
+    assert len(payload["memberIds"]) == 2
+    assert len(payload["counts"]) == 7
+    assert payload["counts"][1][8:14] == [0, 1, 1, 2, 1, 0]
+    assert sum(sum(day) for day in payload["counts"]) == 5
+    owner_bit, member_bit = 1, 2
+    assert base64.b64decode(payload["memberBits"][1][9]) == bytes([owner_bit])
+    assert base64.b64decode(payload["memberBits"][1][11]) == bytes([owner_bit | member_bit])
+    assert base64.b64decode(payload["memberBits"][1][12]) == bytes([member_bit])
+
+    for uneven in (7, 50):
+        rejected = client.get(
+            f"/groups/{group_id}/availability/heatmap",
+            headers={"Authorization": f"Bearer {owner_access}"},
+            params={"increment_minutes": uneven},
+        )
+        assert rejected.status_code == 422, rejected.text
+
+    outsider_access = _register(client, "outsider5@example.com")
+    forbidden = client.get(
+        f"/groups/{group_id}/availability/heatmap",
+        headers={"Authorization": f"Bearer {outsider_access}"},
+    )
+    assert forbidden.status_code == 403
+
+
+def test_group_reads_and_owner_actions_keep_authorization_errors(client):
+    owner_access = _register(client, "owner6@example.com")
+    created = client.post(
+        "/groups/",
+        headers={"Authorization": f"Bearer {owner_access}"},
+        json={"name": "Auth Checks"},
+    )
+    assert created.status_code == 200, created.text
+    group_id = created.json()["id"]
+
+    member_access = _register(client, "member6@example.com")
+    joined = client.post(
+        "/groups/join",
+        headers={"Authorization": f"Bearer {member_access}"},
+        json={"groupId": group_id},
+    )
+    assert joined.status_code == 200, joined.text
+    outsider_access = _register(client, "outsider6@example.com")
+
+    detail = client.get(f"/groups/{group_id}", headers={"Authorization": f"Bearer {member_access}"})
+    assert detail.status_code == 200, detail.text
+    assert detail.json()["role"] == "member"
+    assert [member["role"] for member in detail.json()["members"]] == ["owner", "member"]
+
+    assert client.get(f"/groups/{group_id}", headers={"Authorization": f"Bearer {outsider_access}"}).status_code == 403
+    assert client.get("/groups/999999", headers={"Authorization": f"Bearer {owner_access}"}).status_code == 403
+    missing = client.get("/groups/999999/availability", headers={"Authorization": f"Bearer {owner_access}"})
+    assert missing.status_code == 404
+    outsider = client.get(f"/groups/{group_id}/availability", headers={"Authorization": f"Bearer {outsider_access}"})
+    assert outsider.status_code == 403
+
+    member_id = detail.json()["members"][1]["id"]
+    not_owner = client.delete(
+        f"/groups/{group_id}/members/{member_id}",
+        headers={"Authorization": f"Bearer {member_access}"},
+    )
+    assert not_owner.status_code == 403
+    assert not_owner.json()["detail"] == "Insufficient permissions"
+    not_member = client.post(
+        f"/groups/{group_id}/transfer-ownership",
+        headers={"Authorization": f"Bearer {outsider_access}"},
+        json={"newOwnerId": member_id},
+    )
+    assert not_member.status_code == 403
+    assert not_member.json()["detail"] == "Not a member of this group"
+    unknown_target = client.delete(
+        f"/groups/{group_id}/members/999999",
+        headers={"Authorization": f"Bearer {owner_access}"},
+    )
+    assert unknown_target.status_code == 404
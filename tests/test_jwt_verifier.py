@@ -0,0 +1,44 @@
+import time
+
+import pytest
+from jose import jwt
+
+from app.core.config import settings
+from app.core.jwt_verifier import verified_token_cache, verify_jwt
+from app.core.security import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    verified_token_cache.clear()
+
+
+def test_verify_jwt_matches_jose_claims():
+    token = create_access_token(user_id=7, profile_claims={"email": "ada@example.com"})
+    expected = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    assert verify_jwt(token) == expected
+    assert verify_jwt(token) == expected
+    assert verified_token_cache.stats()["hits"] == 1
+
+
+def test_verify_jwt_rejects_tampered_and_foreign_tokens():
+    token = create_access_token(user_id=7)
+    header, payload, signature = token.split(".")
+    flipped = "A" if signature[0] != "A" else "B"
+    with pytest.raises(ValueError):
+        verify_jwt(f"{header}.{payload}.{flipped}{signature[1:]}")
+    with pytest.raises(ValueError):
+        verify_jwt(jwt.encode({"sub": "7", "type": "access"}, "other-secret", algorithm=settings.jwt_algorithm))
+    with pytest.raises(ValueError):
+        verify_jwt(jwt.encode({"sub": "7", "type": "access"}, settings.jwt_secret, algorithm="HS512"))
+    with pytest.raises(ValueError):
+        verify_jwt("not-a-token")
+
+
+def test_verify_jwt_cache_never_outlives_exp():
+    exp = int(time.time()) + 2
+    token = jwt.encode({"sub": "7", "type": "access", "exp": exp}, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    assert verify_jwt(token)["sub"] == "7"
+    time.sleep(max(exp - time.time(), 0) + 0.1)
+    with pytest.raises(ValueError):
+        verify_jwt(token)
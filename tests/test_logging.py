@@ -0,0 +1,41 @@
+import json
+import logging
+
+from app.core.logging import JsonFormatter, RequestContextFilter, SamplingFilter, request_id_var
+
+
+def _record(level=logging.INFO, **extra):
+    record = logging.LogRecord("app", level, __file__, 1, "GET %s -> %s", ("/meetings/", 200), None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_json_formatter_includes_request_id_and_extra_fields():
+    token = request_id_var.set("req-1")
+    try:
+        record = _record(duration_ms=12.5, sampled=True)
+        RequestContextFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "GET /meetings/ -> 200"
+    assert payload["request_id"] == "req-1"
+    assert payload["duration_ms"] == 12.5
+    assert "sampled" not in payload
+
+
+def test_sampling_only_drops_marked_info_records():
+    sampler = SamplingFilter(0.0)
+    assert sampler.filter(_record(sampled=True)) is False
+    assert sampler.filter(_record()) is True
+    assert sampler.filter(_record(level=logging.WARNING, sampled=True)) is True
+
+
+def test_request_log_only_samples_successful_responses(client, caplog):
+    caplog.set_level(logging.INFO, logger="app")
+    assert client.get("/meetings/").status_code == 401
+
+    (record,) = [record for record in caplog.records if getattr(record, "status", None) == 401]
+    assert record.sampled is False
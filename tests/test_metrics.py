@@ -0,0 +1,29 @@
+def test_metrics_label_requests_by_route_template(client):
+    assert client.get("/meetings/12345").status_code == 401
+    assert client.get("/meetings/67890").status_code == 401
+
+    response = client.get("/metrics")
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/meetings/{meeting_id}",status="401"}' in body
+    assert "/meetings/12345" not in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/meetings/{meeting_id}",le="+Inf"}' in body
+    assert "http_requests_in_flight 1" in body
+    assert 'db_pool_checked_out{engine="sync"}' in body
+    assert 'cache_hits_total{cache="jwt_verify"}' in body
+
+
+def test_server_timing_reports_sql_statements(client):
+    response = client.post(
+        "/auth/register",
+        json={"first_name": "Ada", "last_name": "Lovelace", "email": "ada@example.com", "password": "supersecret123"},
+    )
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = client.get("/meetings/", headers=headers)
+    assert response.status_code == 200, response.text
+    db_timing = response.headers["Server-Timing"].split(",")[0]
+    assert db_timing.startswith("db;dur=")
+    assert 'desc="0 queries"' not in db_timing
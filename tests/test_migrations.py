@@ -0,0 +1,21 @@
+from sqlalchemy import text
+
+from app.db.migrations import MIGRATIONS, run_migrations
+from app.db.session import SessionLocal
+
+
+def test_migrations_are_recorded_and_skipped_when_current(client):
+    assert run_migrations() == 0
+
+    db = SessionLocal()
+    try:
+        versions = db.execute(text("SELECT version FROM schema_migrations ORDER BY version")).scalars().all()
+    finally:
+        db.close()
+
+    assert versions == [version for version, _, _ in MIGRATIONS]
+
+
+def test_migration_versions_are_unique_and_ordered():
+    versions = [version for version, _, _ in MIGRATIONS]
+    assert versions == sorted(set(versions))
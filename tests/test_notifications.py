@@ -1,6 +1,12 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
 from sqlalchemy import text
 
+from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.notification_outbox import dispatch_pending_notifications
 
 
 def register_user(client, *, first_name: str, last_name: str, email: str, password: str = "supersecret123"):
@@ -137,9 +143,9 @@ def test_notifications_created_for_invite_update_cancel(client):
     assert rows[1][0:2] == ("email", "invite")
     assert rows[3][0:2] == ("email", "update")
     assert rows[5][0:2] == ("email", "cancel")
-    assert rows[1][2] in {"sent", "skipped"}
-    assert rows[3][2] in {"sent", "skipped"}
-    assert rows[5][2] in {"sent", "skipped"}
+    assert rows[1][2] in {"pending", "skipped"}
+    assert rows[3][2] in {"pending", "skipped"}
+    assert rows[5][2] in {"pending", "skipped"}
 
 
 def test_invite_message_uses_location_or_meeting_link(client):
@@ -210,3 +216,183 @@ def test_invite_message_uses_location_or_meeting_link(client):
 
     assert "Meeting link: https://zoom.example.com/meeting-123" in virtual_message
     assert "Location:" not in virtual_message
+
+
+class _FakeResendHandler(BaseHTTPRequestHandler):
+    fail_first = set()
+    received = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        emails = body if self.path == "/emails/batch" else [body]
+        recipients = {email["to"][0] for email in emails}
+        if recipients & self.fail_first:
+            self.fail_first -= recipients
+            self.send_response(503)
+            self.end_headers()
+            return
+        self.received.append((self.path, sorted(recipients)))
+        ids = [{"id": f"fake-{len(self.received)}-{index}"} for index in range(len(emails))]
+        payload = json.dumps({"data": ids} if self.path == "/emails/batch" else ids[0]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_email_outbox_batches_identical_messages_and_retries(client, monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), _FakeResendHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _FakeResendHandler.received = []
+    _FakeResendHandler.fail_first = {"grace@example.com"}
+    monkeypatch.setattr(settings, "resend_api_key", "test-key")
+    monkeypatch.setattr(settings, "email_from_address", "scheduler@example.com")
+    monkeypatch.setattr(settings, "resend_api_url", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(settings, "notification_outbox_backoff_seconds", 0)
+
+    try:
+        organizer_token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+        register_user(client, first_name="Grace", last_name="Hopper", email="grace@example.com")
+        register_user(client, first_name="Alan", last_name="Turing", email="alan@example.com")
+
+        create_response = client.post(
+            "/meetings/",
+            headers=auth_headers(organizer_token),
+            json={
+                "title": "Outbox Review",
+                "start_time": "2026-04-21T14:00:00Z",
+                "end_time": "2026-04-21T15:00:00Z",
+                "attendee_emails": ["grace@example.com", "alan@example.com"],
+            },
+        )
+        assert create_response.status_code == 200, create_response.text
+        assert _FakeResendHandler.received == []
+
+        db = SessionLocal()
+        try:
+            assert dispatch_pending_notifications(db) == 2
+            assert _FakeResendHandler.received == []
+            assert dispatch_pending_notifications(db) == 2
+            assert _FakeResendHandler.received == [("/emails/batch", ["alan@example.com", "grace@example.com"])]
+            assert dispatch_pending_notifications(db) == 0
+            rows = db.execute(
+                text(
+                    """
+                    SELECT u.email, n.status, n.attempts, n.provider_message_id
+                    FROM notifications n
+                    JOIN users u ON u.id = n.user_id
+                    WHERE n.channel = 'email'
+                    ORDER BY u.email
+                    """
+                )
+            ).fetchall()
+        finally:
+            db.close()
+    finally:
+        server.shutdown()
+
+    assert [(row[0], row[1], row[2]) for row in rows] == [
+        ("alan@example.com", "sent", 2),
+        ("grace@example.com", "sent", 2),
+    ]
+    assert all(row[3] for row in rows)
+
+
+def test_invite_fan_out_creates_preferences_and_notifications_for_every_attendee(client):
+    organizer_token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    attendee_emails = [f"attendee{index}@example.com" for index in range(6)]
+    for index, email in enumerate(attendee_emails):
+        register_user(client, first_name="Attendee", last_name=str(index), email=email)
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            text(
+                """
+                INSERT INTO notification_preferences (user_id, email_enabled, in_app_enabled)
+                SELECT id, FALSE, TRUE FROM users WHERE email = 'attendee0@example.com'
+                """
+            )
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    create_response = client.post(
+        "/meetings/",
+        headers=auth_headers(organizer_token),
+        json={
+            "title": "All Hands",
+            "start_time": "2026-04-21T14:00:00Z",
+            "end_time": "2026-04-21T15:00:00Z",
+            "attendee_emails": attendee_emails,
+        },
+    )
+    assert create_response.status_code == 200, create_response.text
+
+    db = SessionLocal()
+    try:
+        preference_count = db.execute(text("SELECT COUNT(*) FROM notification_preferences")).scalar_one()
+        rows = db.execute(
+            text(
+                """
+                SELECT u.email, n.channel
+                FROM notifications n
+                JOIN users u ON u.id = n.user_id
+                WHERE n.type = 'invite'
+                ORDER BY n.id
+                """
+            )
+        ).fetchall()
+    finally:
+        db.close()
+
+    assert preference_count == len(attendee_emails)
+    assert rows[0] == ("attendee0@example.com", "in_app")
+    assert [row[0] for row in rows[1:]] == [email for email in attendee_emails[1:] for _ in range(2)]
+    assert [row[1] for row in rows[1:]] == ["in_app", "email"] * (len(attendee_emails) - 1)
+
+
+def test_email_outbox_skips_result_when_lease_was_reclaimed(client, monkeypatch):
+    from app.services import notification_outbox
+
+    organizer_token = register_user(client, first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    register_user(client, first_name="Grace", last_name="Hopper", email="grace@example.com")
+    create_response = client.post(
+        "/meetings/",
+        headers=auth_headers(organizer_token),
+        json={
+            "title": "Lease Review",
+            "start_time": "2026-04-21T14:00:00Z",
+            "end_time": "2026-04-21T15:00:00Z",
+            "attendee_emails": ["grace@example.com"],
+        },
+    )
+    assert create_response.status_code == 200, create_response.text
+
+    def send_after_lease_expired(group):
+        # Another worker re-claims the row while this one is still talking to the provider.
+        other = SessionLocal()
+        try:
+            other.execute(text("UPDATE notifications SET attempts = attempts + 1 WHERE channel = 'email'"))
+            other.commit()
+        finally:
+            other.close()
+        return [(row["id"], "late-id", None) for row in group]
+
+    monkeypatch.setattr(notification_outbox, "_send", send_after_lease_expired)
+
+    db = SessionLocal()
+    try:
+        assert dispatch_pending_notifications(db) == 1
+        row = db.execute(
+            text("SELECT status, attempts, provider_message_id FROM notifications WHERE channel = 'email'")
+        ).one()
+    finally:
+        db.close()
+
+    assert tuple(row) == ("pending", 2, None)
@@ -0,0 +1,34 @@
+import time
+
+from app.core.config import settings
+from app.core.profiling import StackSampler, should_profile, write_profile
+
+
+def _busy_loop(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+def test_sampler_writes_folded_stacks_for_busy_threads(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profiling_dir", str(tmp_path))
+    sampler = StackSampler(0.002)
+    sampler.start()
+    _busy_loop(0.1)
+    sampler.stop()
+
+    filename = write_profile(sampler, request_id="req-1", label="GET /meetings/{meeting_id}")
+    assert filename.endswith("-GET_meetings_meeting_id_-req-1.folded")
+    lines = (tmp_path / filename).read_text().splitlines()
+    assert any("_busy_loop (test_profiling.py:" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_debug_header_requires_matching_token(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_sample_rate", 0.0)
+    monkeypatch.setattr(settings, "profiling_header_token", None)
+    assert should_profile("anything") is False
+
+    monkeypatch.setattr(settings, "profiling_header_token", "s3cret")
+    assert should_profile("s3cret") is True
+    assert should_profile("guess") is False
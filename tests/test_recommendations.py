@@ -0,0 +1,45 @@
+from datetime import date, datetime, timedelta
+
+from app.services.recommendations import _build_bitmap_candidates, _build_day_candidates, _daterange
+
+
+def test_bitmap_engine_matches_interval_engine():
+    start_date = date(2026, 4, 6)
+    end_date = start_date + timedelta(days=6)
+    participant_ids = [1, 2, 3]
+    availability_by_user = {
+        1: {day: [(9 * 60, 17 * 60)] for day in range(7)},
+        2: {day: [(8 * 60, 12 * 60), (13 * 60, 18 * 60)] for day in range(1, 6)},
+        3: {day: [(10 * 60 + 15, 16 * 60)] for day in range(7)},
+    }
+    busy_by_user = {
+        1: [{"id": 1, "start_time": datetime(2026, 4, 7, 10, 0), "end_time": datetime(2026, 4, 7, 11, 30)}],
+        2: [{"id": 2, "start_time": datetime(2026, 4, 8, 23, 0), "end_time": datetime(2026, 4, 9, 14, 0)}],
+        3: [],
+    }
+
+    expected = []
+    for current_date in _daterange(start_date, end_date):
+        expected.extend(
+            _build_day_candidates(
+                current_date=current_date,
+                participant_ids=participant_ids,
+                availability_by_user=availability_by_user,
+                busy_by_user=busy_by_user,
+                duration_minutes=45,
+                increment_minutes=15,
+            )
+        )
+
+    actual = _build_bitmap_candidates(
+        start_date=start_date,
+        end_date=end_date,
+        participant_ids=participant_ids,
+        availability_by_user=availability_by_user,
+        busy_by_user=busy_by_user,
+        duration_minutes=45,
+        increment_minutes=15,
+    )
+
+    assert expected
+    assert actual == expected
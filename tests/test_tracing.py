@@ -0,0 +1,88 @@
+import json
+
+from app.core import tracing
+from app.core.config import settings
+
+
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+
+def _exported_spans(path):
+    spans = []
+    for line in path.read_text().splitlines():
+        for resource in json.loads(line)["resourceSpans"]:
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return spans
+
+
+def _register(client, email: str) -> dict[str, str]:
+    response = client.post(
+        "/auth/register",
+        json={"first_name": "Ada", "last_name": "Lovelace", "email": email, "password": "supersecret123"},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_request_spans_nest_service_and_sql_under_the_server_span(client, monkeypatch, tmp_path):
+    headers = _register(client, "ada@example.com")
+    _register(client, "grace@example.com")
+    create_response = client.post(
+        "/meetings/",
+        headers=headers,
+        json={
+            "title": "Traced Review",
+            "start_time": "2026-04-21T14:00:00Z",
+            "end_time": "2026-04-21T15:00:00Z",
+            "attendee_emails": ["grace@example.com"],
+        },
+    )
+    assert create_response.status_code == 200, create_response.text
+    meeting_id = create_response.json()["id"]
+
+    # Only the request under test is traced.
+    trace_file = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "tracing_file_path", str(trace_file))
+    monkeypatch.setattr(tracing, "_exporter", None)
+
+    request_id = "0b6f1f2e-6c64-4a4c-9d5b-0e8a1c2f3d4e"
+    response = client.post(
+        f"/meetings/{meeting_id}/reschedule-suggestions",
+        headers={**headers, "X-Request-ID": request_id},
+        json={
+            "attendee_emails": ["grace@example.com"],
+            "start_date": "2026-04-20",
+            "end_date": "2026-04-24",
+            "duration_minutes": 30,
+        },
+    )
+    assert response.status_code == 200, response.text
+    tracing._get_exporter().shutdown()
+
+    spans = _exported_spans(trace_file)
+    assert {span["traceId"] for span in spans} == {request_id.replace("-", "")}
+
+    (root,) = [span for span in spans if "parentSpanId" not in span]
+    assert root["kind"] == SPAN_KIND_SERVER
+    assert root["name"] == "POST /meetings/{meeting_id}/reschedule-suggestions"
+
+    by_id = {span["spanId"]: span for span in spans}
+    for span in spans:
+        if span is not root:
+            assert span["parentSpanId"] in by_id
+
+    (recommend,) = [span for span in spans if span["name"].endswith("recommendations.recommend_common_slots")]
+    assert recommend["parentSpanId"] == root["spanId"]
+
+    sql_spans = [span for span in spans if span["kind"] == SPAN_KIND_CLIENT]
+    assert any(span["parentSpanId"] == root["spanId"] for span in sql_spans)
+
+    def _ancestors(span):
+        while "parentSpanId" in span:
+            span = by_id[span["parentSpanId"]]
+            yield span["spanId"]
+
+    assert any(recommend["spanId"] in _ancestors(span) for span in sql_spans)